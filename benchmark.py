@@ -0,0 +1,327 @@
+"""
+Author : Gabriel de Haro
+Date : December 12th, 2024
+Description: Benchmarks the solutions of every day on scaled synthetic inputs, fits
+the growth curve of each solving mode and saves the results as JSON.
+"""
+
+import argparse
+import datetime
+import io
+import json
+import math
+import multiprocessing
+import os
+import platform
+import subprocess
+import tempfile
+
+import generators
+import runner
+
+
+def solve_with_runner(day: int):
+    """Returns a case solving both parts of a day the same way as the runner."""
+    solver = runner.SOLVERS[day]
+
+    def case(module, content: str) -> tuple:
+        data = solver["parse"](module, content)
+        cache = {}
+        return tuple(solver[part](module, data, cache) for part in runner.PARTS)
+
+    return case
+
+
+# For each day, the solving modes to compare. Every case takes the loaded module of
+# the day and the raw input, and returns the answers of the parts it solves.
+CASES = {day: {"default": solve_with_runner(day)} for day in runner.SOLVERS}
+
+
+def solve_day_6_parallel(module, content: str) -> tuple:
+    """Solves day 6 with the candidate obstacles of part two split across all cores."""
+    map = module.string_to_grid(content)
+    walked = module.walk_guard(map, module.find_guard_position(map))
+    return len(walked[0]), module.part_two(map, walked, os.cpu_count())
+
+
+def solve_day_2_batch(module, content: str) -> tuple:
+    """Solves day 2 checking the reports of the same length together."""
+    report_list = module.parse_reports(content)
+    return module.part_one_batch(report_list), module.part_two_batch(report_list)
+
+
+def solve_day_2_brute_force(module, content: str) -> tuple:
+    """Solves day 2 trying every removal of a level for the problem dampener."""
+    report_list = module.parse_reports(content)
+    return module.part_one(report_list), module.part_two(report_list, "brute_force")
+
+
+def solve_day_7_parallel(module, content: str) -> tuple:
+    """Solves day 7 with batches of equations spread across all cores."""
+    data = module.get_data(content)
+    return tuple(
+        module.part_one_and_two(data, operator, os.cpu_count())
+        for operator in [module.OPERATORS_1, module.OPERATORS_2]
+    )
+
+
+def solve_day_9_image(module, content: str) -> tuple:
+    """Solves day 9 on the NumPy block image of the disk."""
+    return module.part_one_image(content), module.part_two_image(content)
+
+
+def solve_day_10_iterative(module, content: str) -> tuple:
+    """Solves day 10 with the iterative trail explorer."""
+    map = module.string_to_grid(content)
+    return module.explore_trails(map)
+
+
+def solve_day_11_memoized(module, content: str) -> tuple:
+    """Solves day 11 with the memoized count of each stone, without the on-disk cache."""
+    stones = module.get_data(content)
+    return tuple(module.part_one_and_two_memoized(stones, blinks) for blinks in [25, 75])
+
+
+def solve_day_11_recurrence(module, content: str) -> tuple:
+    """Solves day 11 with the sparse transitions and linear recurrence, modulo the modulus of the day."""
+    counts = module.counts_with_recurrence(
+        module.get_data(content), [25, 75], MODULI[(11, "recurrence")]
+    )
+    return counts[25], counts[75]
+
+
+def solve_day_5_vectorized(module, content: str) -> tuple:
+    """Solves day 5 with the rule matrix and manual batches spread across all cores."""
+    rules_dict, manuals = module.split_sections(content)
+    return module.part_one_and_two_vectorized(rules_dict, manuals, os.cpu_count())
+
+
+def solve_day_3_stream(module, content: str) -> tuple:
+    """Solves day 3 in a single streaming pass over chunks of 64 KiB."""
+    file = io.BytesIO(content.encode())
+    return module.scan_chunks(module.read_chunks(file, 1 << 16))
+
+
+def solve_day_3_sharded(module, content: str) -> tuple:
+    """Solves day 3 scanning shards of the input across all cores, from a temporary file."""
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "input.txt")
+        with open(filepath, "wb") as file:
+            file.write(content.encode())
+        shard_size = max(1 << 16, len(content) // (4 * os.cpu_count()) + 1)
+        return module.part_one_and_two_sharded(filepath, os.cpu_count(), shard_size)
+
+
+def solve_day_1_numpy(module, content: str) -> tuple:
+    """Solves day 1 on NumPy arrays of the columns."""
+    col1, col2 = module.parse_columns_array(content)
+    return module.part_one_array(col1, col2), module.part_two_array(col1, col2)
+
+
+def solve_day_1_external(module, content: str) -> tuple:
+    """Solves day 1 by external sort from a temporary file, within about 16 MiB."""
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "input.txt")
+        with open(filepath, "w", encoding="utf-8") as file:
+            file.write(content)
+        return module.part_one_and_two_external(filepath, 1 << 24, directory)
+
+
+CASES[1]["numpy"] = solve_day_1_numpy
+CASES[1]["external"] = solve_day_1_external
+CASES[2]["batch"] = solve_day_2_batch
+CASES[2]["brute_force"] = solve_day_2_brute_force
+CASES[3]["stream"] = solve_day_3_stream
+CASES[3]["sharded"] = solve_day_3_sharded
+CASES[5]["vectorized"] = solve_day_5_vectorized
+CASES[6]["parallel"] = solve_day_6_parallel
+CASES[7]["parallel"] = solve_day_7_parallel
+CASES[9]["image"] = solve_day_9_image
+CASES[10]["iterative"] = solve_day_10_iterative
+CASES[11]["memoized"] = solve_day_11_memoized
+CASES[11]["recurrence"] = solve_day_11_recurrence
+
+# Cases returning their answers modulo a number, checked against the other cases modulo it.
+MODULI = {(11, "recurrence"): 2**31 - 1}
+
+
+def run_case(connection, day: int, case: str, content: str, track_memory: bool) -> None:
+    """Runs one case in a child process and sends back its result, time and peak memory."""
+    module = runner.load_day(day)
+    result, elapsed, peak = runner.measure(
+        lambda: CASES[day][case](module, content), track_memory
+    )
+    connection.send((result, elapsed, peak))
+    connection.close()
+
+
+def measure_case(day: int, case: str, content: str, timeout: float, track_memory: bool) -> dict:
+    """Measures one case in a separate process, killing it when it exceeds timeout seconds."""
+    parent, child = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=run_case, args=(child, day, case, content, track_memory)
+    )
+    process.start()
+    child.close()
+    if not parent.poll(timeout):
+        process.terminate()
+        process.join()
+        return {"status": "timeout", "time": None, "peak": None, "result": None}
+    try:
+        result, elapsed, peak = parent.recv()
+    except EOFError:
+        process.join()
+        return {"status": "error", "time": None, "peak": None, "result": None}
+    process.join()
+    result = [int(value) for value in result]
+    return {"status": "ok", "time": elapsed, "peak": peak, "result": result}
+
+
+def fit_exponent(points: list) -> float:
+    """Fits time = c * size ** k by least squares in log-log space and returns k."""
+    points = [(size, time) for size, time in points if time and time > 0]
+    if len(points) < 2:
+        return None
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(time) for _, time in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def current_commit() -> str:
+    """Returns the hash of the current git commit, or None outside of a repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=runner.ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(
+    days: list,
+    cases: list,
+    scales: list,
+    seed: int,
+    timeout: float,
+    track_memory: bool,
+) -> dict:
+    """Runs every selected case of every day on each scale, skipping larger scales after a timeout."""
+    results = []
+    fits = []
+    for day in days:
+        contents = {scale: generators.generate(day, scale, seed) for scale in scales}
+        answers = {}
+        for case in CASES[day]:
+            if cases and case not in cases:
+                continue
+            points = []
+            timed_out = False
+            for scale in scales:
+                content = contents[scale]
+                if timed_out:
+                    measure = {"status": "skipped", "time": None, "peak": None, "result": None}
+                else:
+                    measure = measure_case(day, case, content, timeout, track_memory)
+                    timed_out = measure["status"] != "ok"
+                measure["throughput"] = None
+                if measure["status"] == "ok":
+                    points.append((len(content), measure["time"]))
+                    if measure["time"] > 0:
+                        measure["throughput"] = len(content) / measure["time"] / 1e6
+                    expected = answers.setdefault(scale, measure["result"])
+                    if (day, case) in MODULI:
+                        expected = [value % MODULI[(day, case)] for value in expected]
+                    n = min(len(expected), len(measure["result"]))
+                    if expected[:n] != measure["result"][:n]:
+                        measure["status"] = "mismatch"
+                results.append(
+                    {"day": day, "case": case, "scale": scale, "size": len(content), **measure}
+                )
+                print_line(results[-1])
+            exponent = fit_exponent(points)
+            fits.append({"day": day, "case": case, "exponent": exponent})
+            if exponent is not None:
+                print(f"{day:>4} {case:<16} growth ~ O(n^{exponent:.2f})")
+    return {
+        "commit": current_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "seed": seed,
+        "results": results,
+        "fits": fits,
+    }
+
+
+def print_line(result: dict) -> None:
+    """Prints the measure of one case at one scale."""
+    elapsed = "-" if result["time"] is None else f"{result['time'] * 1000:.1f}ms"
+    throughput = "-" if result["throughput"] is None else f"{result['throughput']:.2f}MB/s"
+    print(
+        f"{result['day']:>4} {result['case']:<16} x{result['scale']:<6g} "
+        f"{result['size']:>11} B {elapsed:>12} {throughput:>12} "
+        f"{runner.format_memory(result['peak']):>10} {result['status']}"
+    )
+
+
+def compare(previous: dict, current: dict, threshold: float) -> list:
+    """Returns the measures that got slower than threshold times their previous value."""
+    before = {
+        (r["day"], r["case"], r["scale"]): r["time"] for r in previous["results"] if r["time"]
+    }
+    regressions = []
+    for result in current["results"]:
+        old = before.get((result["day"], result["case"], result["scale"]))
+        if old and result["time"] and result["time"] > threshold * old:
+            regressions.append({**result, "previous_time": old})
+    return regressions
+
+
+def main() -> None:
+    """Main function to parse the command line, run the benchmark and save the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("days", nargs="*", type=int, help="days to benchmark (default: all)")
+    parser.add_argument("--cases", nargs="*", default=[], help="solving modes to run")
+    parser.add_argument("--scales", nargs="*", type=float, default=[1, 10, 100])
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--timeout", type=float, default=60, help="seconds per measure")
+    parser.add_argument("--memory", action="store_true", help="track peak memory")
+    parser.add_argument("-o", "--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="previous results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.days or sorted(CASES),
+        args.cases,
+        args.scales,
+        args.seed,
+        args.timeout,
+        args.memory,
+    )
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            previous = json.load(file)
+        regressions = compare(previous, report, args.threshold)
+        for result in regressions:
+            print(
+                f"Regression: day {result['day']} {result['case']} x{result['scale']:g} "
+                f"{result['previous_time'] * 1000:.1f}ms -> {result['time'] * 1000:.1f}ms"
+            )
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,18 @@ Date : December 1st, 2024
 Description: Solutions for Day 1 of Advent of Code 2024.
 """
 
+import heapq
+import os
+import tempfile
+from array import array
 from collections import Counter
+from itertools import groupby
+
+import numpy as np
+
+# Rough number of bytes held per location ID while a run is sorted: its slot in the
+# array('q'), its slot in the sorted list and the int object itself.
+RUN_ITEM_MEMORY = 48
 
 
 def read_file(filepath: str) -> str:
@@ -22,9 +33,7 @@ def parse_columns(content: str) -> tuple[list[int], list[int]]:
 
 def part_one(col1: list, col2: list) -> int:
     """Calculates the sum of absolute differences between sorted elements of two columns."""
-    col1.sort()
-    col2.sort()
-    return sum(abs(i - j) for i, j in zip(col1, col2))
+    return sum(abs(i - j) for i, j in zip(sorted(col1), sorted(col2)))
 
 
 def part_two(col1: list, col2: list) -> int:
@@ -33,6 +42,133 @@ def part_two(col1: list, col2: list) -> int:
     return sum(col2_counts[num] * num for num in col1)
 
 
+def columns_from_values(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Splits the flat array of the numbers of the input, line by line, into its two columns."""
+    if len(values) % 2:
+        raise ValueError("Every line must hold exactly two location IDs.")
+    return values[0::2], values[1::2]
+
+
+def parse_columns_array(content: str) -> tuple[np.ndarray, np.ndarray]:
+    """Parses the input string into two int64 arrays in a single bulk conversion."""
+    return columns_from_values(np.fromstring(content, dtype=np.int64, sep=" "))
+
+
+def load_columns_array(filepath: str) -> tuple[np.ndarray, np.ndarray]:
+    """Loads the two columns of a file straight into int64 arrays, without building a string."""
+    return columns_from_values(np.fromfile(filepath, dtype=np.int64, sep=" "))
+
+
+def part_one_array(col1: np.ndarray, col2: np.ndarray) -> int:
+    """Calculates the distance between the columns as part_one, with NumPy sorts."""
+    return int(np.abs(np.sort(col1) - np.sort(col2)).sum())
+
+
+def part_two_array(col1: np.ndarray, col2: np.ndarray) -> int:
+    """Calculates the similarity score as part_two, looking up the elements of col1 in the
+    sorted distinct values of col2 and their counts."""
+    values, counts = np.unique(col2, return_counts=True)
+    if not len(values):
+        return 0
+    indexes = np.minimum(np.searchsorted(values, col1), len(values) - 1)
+    found = values[indexes] == col1
+    return int((col1[found] * counts[indexes[found]]).sum())
+
+
+def write_run(columns: tuple, directory: str, index: int) -> tuple:
+    """Sorts each column of a run and dumps it as int64 to a binary file, returning both paths."""
+    paths = []
+    for side, column in enumerate(columns):
+        path = os.path.join(directory, f"run_{index}_{side}.bin")
+        with open(path, "wb") as file:
+            array("q", sorted(column)).tofile(file)
+        paths.append(path)
+    return tuple(paths)
+
+
+def spill_sorted_runs(filepath: str, directory: str, run_length: int) -> list:
+    """Streams the file line by line and spills both columns in sorted runs of run_length IDs,
+    returning the paths of the left and right files of each run."""
+    runs = []
+    columns = (array("q"), array("q"))
+    with open(filepath, "r", encoding="utf-8") as file:
+        for line in file:
+            values = line.split()
+            if not values:
+                continue
+            columns[0].append(int(values[0]))
+            columns[1].append(int(values[1]))
+            if len(columns[0]) == run_length:
+                runs.append(write_run(columns, directory, len(runs)))
+                columns = (array("q"), array("q"))
+    if columns[0]:
+        runs.append(write_run(columns, directory, len(runs)))
+    return runs
+
+
+def read_run(path: str, buffer_length: int):
+    """Yields the IDs of a run file, reading buffer_length of them at a time."""
+    with open(path, "rb") as file:
+        while True:
+            buffer = array("q")
+            try:
+                buffer.fromfile(file, buffer_length)
+            except EOFError:
+                yield from buffer
+                return
+            yield from buffer
+
+
+def merge_runs(paths: list, buffer_length: int):
+    """Yields the IDs of all the sorted runs of a column in sorted order, by a k-way merge."""
+    return heapq.merge(*[read_run(path, buffer_length) for path in paths])
+
+
+def count_groups(values):
+    """Yields each distinct value of a sorted stream with its number of occurrences."""
+    for value, group in groupby(values):
+        yield value, sum(1 for _ in group)
+
+
+def similarity_of_sorted(col1, col2) -> int:
+    """Calculates the similarity score of two sorted streams by joining their value counts."""
+    counts2 = count_groups(col2)
+    value2, count2 = next(counts2, (None, 0))
+    result = 0
+    for value1, count1 in count_groups(col1):
+        while value2 is not None and value2 < value1:
+            value2, count2 = next(counts2, (None, 0))
+        if value2 is None:
+            break
+        if value2 == value1:
+            result += value1 * count1 * count2
+    return result
+
+
+def part_one_and_two_external(
+    filepath: str, max_memory: int = 1 << 26, temp_dir: str = None
+) -> tuple[int, int]:
+    """Solves both parts for a file too large for memory, keeping roughly max_memory bytes at once.
+
+    Both columns are spilled in sorted runs to a temporary directory, then the runs are merged
+    back in sorted order: the two merged columns are walked in lockstep for part one, and their
+    value counts are joined for part two, so no frequency table of the whole file is built.
+    """
+    run_length = max(1, max_memory // (2 * RUN_ITEM_MEMORY))
+    with tempfile.TemporaryDirectory(dir=temp_dir) as directory:
+        runs = spill_sorted_runs(filepath, directory, run_length)
+        buffer_length = max(1, max_memory // (2 * max(1, len(runs)) * RUN_ITEM_MEMORY))
+        left, right = [run[0] for run in runs], [run[1] for run in runs]
+        result_one = sum(
+            abs(i - j)
+            for i, j in zip(merge_runs(left, buffer_length), merge_runs(right, buffer_length))
+        )
+        result_two = similarity_of_sorted(
+            merge_runs(left, buffer_length), merge_runs(right, buffer_length)
+        )
+    return result_one, result_two
+
+
 def main() -> None:
     """Main function to read input, solve the problem, and display results."""
     content = read_file("D:/Project/Advent_Of_Code_2024/day_1/input.txt")
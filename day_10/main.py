@@ -5,80 +5,111 @@ Description: Solutions for Day 10 of Advent of Code 2024.
 """
 
 import numpy as np
-from typing import Union
-
-
-def read_file(filepath: str) -> str:
-    """Reads the content of a file and returns it as a string."""
-    with open(filepath, "r", encoding="utf-8") as file:
-        return file.read()
-
-
-def string_to_array(content: str) -> np.array:
-    """Converts the string content into a 2D numpy array."""
-    lines = content.splitlines()
-    arr = np.array([list(line) for line in lines])
-    return [[int(val) for val in row] for row in arr]
-
-
-def dfs(row: int, col: int, map: np.array, visited: set, part: str) -> Union[int, set]:
-    """Recursively explores valid paths and counts reachable '9' or returns set of reachable '9' positions based on the part parameter."""
-    rows, cols = len(map), len(map[0])
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-    if map[row][col] == 9:
-        if part == "1":
-            return {(row, col)}
-        if part == "2":
-            return 1
-
-    count = 0
-    reachable_nines = set()
-
-    for dr, dc in directions:
-        nr, nc = row + dr, col + dc
-        if 0 <= nr < rows and 0 <= nc < cols and (nr, nc) not in visited:
-            if map[nr][nc] == map[row][col] + 1:
-                visited.add((nr, nc))
-                result = dfs(nr, nc, map, visited, part)
-                visited.remove((nr, nc))
-
-                if part == "1":
-                    reachable_nines.update(result)
-                if part == "2":
-                    count += result
 
+from grid import DIRECTIONS_4, Grid, read_grid
+
+
+def string_to_grid(content: str) -> Grid:
+    """Converts the content, as str or bytes, into a compact grid."""
+    return Grid.from_text(content)
+
+
+def shifted_sum(layer: np.ndarray) -> np.ndarray:
+    """Returns, for each cell, the sum of the values of its four neighbors."""
+    padded = np.pad(layer, 1)
+    return padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]
+
+
+def count_trails(map: Grid, top: int = 9) -> tuple[int, int]:
+    """Calculates the sum of the scores and the sum of the ratings of all trailheads in a single
+    pass over the heights, from top down to 0.
+
+    Ratings: the number of paths from a cell to a peak is the sum over its neighbors one unit
+    higher, computed for a whole height layer at once with shifted arrays.
+    Scores: each cell keeps the set of peaks it reaches as an int bitset, or-ed from its
+    neighbors one unit higher. A peak is encoded by its offset from the cell inside a box of
+    side 2 * top + 1, so that moving to a neighbor only shifts the bits.
+    """
+    heights = map.heights()
+    width = 2 * top + 1
+    paths = (heights == top).astype(np.int64)
+    peaks = {(i, j): 1 << (top * width + top) for i, j in np.argwhere(heights == top).tolist()}
+    for height in range(top - 1, -1, -1):
+        paths = (heights == height) * shifted_sum(paths)
+        layer = {}
+        for i, j in np.argwhere(heights == height).tolist():
+            bits = 0
+            for di, dj in DIRECTIONS_4:
+                neighbor = peaks.get((i + di, j + dj))
+                if neighbor:
+                    shift = di * width + dj
+                    bits |= neighbor << shift if shift > 0 else neighbor >> -shift
+            if bits:
+                layer[(i, j)] = bits
+        peaks = layer
+    score = sum(bin(bits).count("1") for bits in peaks.values())
+    return score, int(paths.sum())
+
+
+def is_next_height(height: int, next_height: int) -> bool:
+    """Default step rule of a hiking trail: each step goes up by exactly one."""
+    return next_height == height + 1
+
+
+def explore_trails(
+    map: Grid, start: int = 0, end: int = 9, step=is_next_height
+) -> tuple[int, int]:
+    """Calculates the sum of the scores and the sum of the ratings of the trailheads (cells of
+    height start) without recursion, for any height range and step rule.
+
+    From each trailhead, the frontier maps the positions reached after the same number of steps
+    to their number of paths, so memory is bounded by the frontier instead of the trail length.
+    Cells of height end are peaks and end the trails. The step rule must make heights strictly
+    increase, otherwise trails could loop forever.
+    """
+    heights = map.heights()
+    values = heights.tolist()
+    score, rating = 0, 0
+    for i, j in np.argwhere(heights == start).tolist():
+        frontier = {(i, j): 1}
+        peaks = set()
+        while frontier:
+            next_frontier = {}
+            for (r, c), count in frontier.items():
+                if values[r][c] == end:
+                    peaks.add((r, c))
+                    rating += count
+                    continue
+                for nr, nc in map.neighbors(r, c):
+                    if step(values[r][c], values[nr][nc]):
+                        next_frontier[(nr, nc)] = next_frontier.get((nr, nc), 0) + count
+            frontier = next_frontier
+        score += len(peaks)
+    return score, rating
+
+
+TRAIL_METHODS = {
+    "layers": count_trails,
+    "iterative": explore_trails,
+}
+
+
+def part_one_and_two(map: Grid, part: str, method: str = "layers") -> int:
+    """Calculates the total result for all the trailheads based on the specified part ('1' or '2'),
+    with the height-layered dynamic program or the iterative explorer."""
+    score, rating = TRAIL_METHODS[method](map)
     if part == "1":
-        return reachable_nines
+        return score
     if part == "2":
-        return count
-
-
-def part_one_and_two(map: np.array, part: str) -> int:
-    """Calculates the total result by calling dfs for each trailhead based on the specified part ('1' or '2')"""
-    rows, cols = len(map), len(map[0])
-    total_result = 0
-
-    for r in range(rows):
-        for c in range(cols):
-            if map[r][c] == 0:
-                visited = {(r, c)}
-                result = dfs(r, c, map, visited, part)
-
-                if part == "1":
-                    total_result += len(result)
-                if part == "2":
-                    total_result += result
-
-    return total_result
+        return rating
 
 
 def main() -> None:
     """Main function to read input, solve the problem, and display results."""
-    content = read_file(r"D:/Project/Advent_Of_Code_2024/day_10/input.txt")
-    map = string_to_array(content)
-    print(f"The result of part 1 is : {part_one_and_two(map, '1')}")
-    print(f"The result of part 2 is : {part_one_and_two(map, '2')}")
+    map = read_grid(r"D:/Project/Advent_Of_Code_2024/day_10/input.txt")
+    score, rating = count_trails(map)
+    print(f"The result of part 1 is : {score}")
+    print(f"The result of part 2 is : {rating}")
 
 
 if __name__ == "__main__":
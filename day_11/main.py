@@ -4,8 +4,24 @@ Date : December 11th, 2024
 Description: Solutions for Day 11 of Advent of Code 2024.
 """
 
+import math
+import os
+import pickle
 import re
+from bisect import bisect_right
 from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+POWERS_OF_TEN = [10**i for i in range(64)]
+STONE_CACHE_SIZE = 1 << 16
+COUNT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stone_counts.pickle")
+
+MODULUS = 2**31 - 1
+
+# Number of stones a stone turns into after a number of blinks, keyed by (stone, blinks).
+STONE_COUNTS = {}
 
 
 def read_file(filepath: str) -> str:
@@ -21,38 +37,237 @@ def get_data(content: str) -> list:
     return [int(match) for match in matches]
 
 
-def apply_rules(counter: Counter) -> Counter:
+def digit_count(stone: int) -> int:
+    """Returns the number of digits of a stone with integer comparisons against powers of ten."""
+    if stone < POWERS_OF_TEN[-1]:
+        return max(1, bisect_right(POWERS_OF_TEN, stone))
+    return len(str(stone))
+
+
+@lru_cache(maxsize=STONE_CACHE_SIZE)
+def blink_stone(stone: int) -> tuple:
+    """Returns the stones replacing a stone after one blink. Kept in a bounded cache shared
+    across blinks and runs, since the same stone values keep coming back."""
+    if stone == 0:
+        return (1,)
+    digits = digit_count(stone)
+    if digits % 2 == 0:
+        return divmod(stone, 10 ** (digits // 2))
+    return (stone * 2024,)
+
+
+def apply_rules(counter: Counter) -> dict:
     """Applies transformation rules to stones in the counter and returns the updated counter."""
-    new_counter = Counter()
+    new_counter = {}
     for stone, count in counter.items():
-        if stone == 0:
-            new_counter[1] += count
-        else:
-            str_stone = str(stone)
-            if len(str_stone) % 2 == 0:
-                mid = len(str_stone) // 2
-                left = int(str_stone[:mid])
-                right = int(str_stone[mid:])
-                new_counter[left] += count
-                new_counter[right] += count
-            else:
-                new_counter[stone * 2024] += count
+        for new_stone in blink_stone(stone):
+            new_counter[new_stone] = new_counter.get(new_stone, 0) + count
     return new_counter
 
 
+def counts_at_blinks(stones: list, blinks: list) -> dict:
+    """Evolves the stones once up to the largest number of blinks and returns the number of
+    stones after each of the requested numbers of blinks."""
+    counter = Counter(stones)
+    results = {}
+    for blink in range(max(blinks) + 1):
+        if blink in blinks:
+            results[blink] = sum(counter.values())
+        if blink < max(blinks):
+            counter = apply_rules(counter)
+    return results
+
+
 def part_one_and_two(stones: list, nb_iter: int) -> int:
     """Simulates the transformation of stones for a given number of iterations and returns the total number of stones."""
-    counter = Counter(stones)
-    for _ in range(nb_iter):
-        counter = apply_rules(counter)
-    return sum(counter.values())
+    return counts_at_blinks(stones, [nb_iter])[nb_iter]
+
+
+def count(stone: int, blinks: int) -> int:
+    """Returns the number of stones a single stone turns into after the given number of blinks,
+    memoized in STONE_COUNTS. Without recursion: the stones missing from STONE_COUNTS are first
+    listed level by level of remaining blinks, then filled from the fewest blinks up."""
+    if blinks == 0:
+        return 1
+    levels = []
+    remaining = blinks
+    frontier = set() if (stone, blinks) in STONE_COUNTS else {stone}
+    while frontier:
+        levels.append((remaining, frontier))
+        remaining -= 1
+        frontier = {
+            new_stone
+            for old_stone in frontier
+            for new_stone in blink_stone(old_stone)
+            if remaining and (new_stone, remaining) not in STONE_COUNTS
+        }
+    for remaining, frontier in reversed(levels):
+        for old_stone in frontier:
+            STONE_COUNTS[(old_stone, remaining)] = sum(
+                STONE_COUNTS[(new_stone, remaining - 1)] if remaining > 1 else 1
+                for new_stone in blink_stone(old_stone)
+            )
+    return STONE_COUNTS[(stone, blinks)]
+
+
+def load_count_cache(filepath: str = COUNT_CACHE_PATH) -> None:
+    """Adds the counts saved by previous runs to STONE_COUNTS, if the cache file exists."""
+    if os.path.isfile(filepath):
+        with open(filepath, "rb") as file:
+            STONE_COUNTS.update(pickle.load(file))
+
+
+def save_count_cache(filepath: str = COUNT_CACHE_PATH) -> None:
+    """Saves STONE_COUNTS to the cache file, replacing it only once fully written."""
+    with open(filepath + ".tmp", "wb") as file:
+        pickle.dump(STONE_COUNTS, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(filepath + ".tmp", filepath)
+
+
+def part_one_and_two_memoized(stones: list, nb_iter: int, cache_path: str = None) -> int:
+    """Same as part_one_and_two, summing the memoized count of each initial stone. With a
+    cache_path, sub-results of previous runs are reused and the new ones saved for later runs."""
+    if cache_path:
+        load_count_cache(cache_path)
+    result = sum(count(stone, nb_iter) for stone in stones)
+    if cache_path:
+        save_count_cache(cache_path)
+    return result
+
+
+def stone_closure(stones: list) -> list:
+    """Returns every stone value reachable from the given stones, whatever the number of blinks."""
+    seen = set(stones)
+    to_visit = list(seen)
+    while to_visit:
+        for new_stone in blink_stone(to_visit.pop()):
+            if new_stone not in seen:
+                seen.add(new_stone)
+                to_visit.append(new_stone)
+    return sorted(seen)
+
+
+def transition_edges(states: list) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the index in states of each stone value and of each stone it turns into after a
+    blink, one pair per new stone: the transition matrix has at most two nonzeros per row."""
+    index = {stone: i for i, stone in enumerate(states)}
+    sources, targets = [], []
+    for i, stone in enumerate(states):
+        for new_stone in blink_stone(stone):
+            sources.append(i)
+            targets.append(index[new_stone])
+    return np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64)
+
+
+def count_sequence(stones: list, states: list, length: int, modulus: int) -> np.ndarray:
+    """Returns the number of stones modulo modulus after 0 to length - 1 blinks, moving the count
+    of each stone value along the sparse transitions at each blink."""
+    sources, targets = transition_edges(states)
+    index = {stone: i for i, stone in enumerate(states)}
+    counts = np.zeros(len(states), dtype=np.int64)
+    for stone, count in Counter(stones).items():
+        counts[index[stone]] = count % modulus
+    sequence = np.zeros(length, dtype=np.int64)
+    for blink in range(length):
+        sequence[blink] = counts.sum() % modulus
+        # Each sum has a handful of terms below 2^31, exact in float64.
+        weights = np.bincount(targets, weights=counts[sources], minlength=len(states))
+        counts = weights.astype(np.int64) % modulus
+    return sequence
+
+
+def berlekamp_massey(sequence: np.ndarray, modulus: int) -> np.ndarray:
+    """Returns the coefficients c of the shortest linear recurrence sum(c[j] * s[k - j]) = 0
+    modulo a prime modulus satisfied by the sequence s, with c[0] = 1."""
+    size = len(sequence) + 1
+    current, previous = np.zeros(size, dtype=np.int64), np.zeros(size, dtype=np.int64)
+    current[0] = previous[0] = 1
+    length, shift, previous_discrepancy = 0, 1, 1
+    for n in range(len(sequence)):
+        window = sequence[n - length : n + 1][::-1]
+        discrepancy = int((current[: length + 1] * window % modulus).sum() % modulus)
+        if discrepancy == 0:
+            shift += 1
+            continue
+        coefficient = discrepancy * pow(previous_discrepancy, modulus - 2, modulus) % modulus
+        updated = current.copy()
+        updated[shift:] = (updated[shift:] - coefficient * previous[: size - shift]) % modulus
+        if 2 * length <= n:
+            previous, length, previous_discrepancy, shift = current, n + 1 - length, discrepancy, 1
+        else:
+            shift += 1
+        current = updated
+    return current[: length + 1]
+
+
+def multiply_polynomials(a: np.ndarray, b: np.ndarray, modulus: int) -> np.ndarray:
+    """Multiplies two polynomials with coefficients below modulus (< 2^31), modulo modulus.
+    The coefficients are split in 16-bit limbs so that the int64 convolutions cannot overflow."""
+    a_high, a_low = np.divmod(a, 1 << 16)
+    b_high, b_low = np.divmod(b, 1 << 16)
+    high = np.convolve(a_high, b_high) % modulus
+    middle = (np.convolve(a_high, b_low) + np.convolve(a_low, b_high)) % modulus
+    low = np.convolve(a_low, b_low) % modulus
+    return (high * (2**32 % modulus) + middle * (2**16 % modulus) % modulus + low) % modulus
+
+
+def reduce_polynomial(polynomial: np.ndarray, divisor: np.ndarray, modulus: int) -> np.ndarray:
+    """Returns the remainder of a polynomial divided by a monic divisor, modulo modulus."""
+    degree = len(divisor) - 1
+    remainder = polynomial.copy()
+    for i in range(len(remainder) - 1, degree - 1, -1):
+        if remainder[i]:
+            remainder[i - degree : i + 1] = (
+                remainder[i - degree : i + 1] - remainder[i] * divisor
+            ) % modulus
+    return remainder[:degree]
+
+
+def power_of_x(exponent: int, divisor: np.ndarray, modulus: int) -> np.ndarray:
+    """Returns x^exponent modulo a monic polynomial of degree at least 1, modulo modulus."""
+    result = reduce_polynomial(np.array([1], dtype=np.int64), divisor, modulus)
+    for bit in bin(exponent)[2:]:
+        result = reduce_polynomial(multiply_polynomials(result, result, modulus), divisor, modulus)
+        if bit == "1":
+            result = reduce_polynomial(np.concatenate(([0], result)), divisor, modulus)
+    return result
+
+
+def is_prime(number: int) -> bool:
+    """Checks if a number is prime by trial division."""
+    return number > 1 and all(number % d for d in range(2, math.isqrt(number) + 1))
+
+
+def counts_with_recurrence(stones: list, blinks: list, modulus: int = MODULUS) -> dict:
+    """Returns the number of stones modulo a prime modulus after each of the requested numbers of
+    blinks. The counts are stepped along the sparse transitions of the closed set of stone values;
+    beyond twice the number of values, Berlekamp-Massey finds the linear recurrence of the counts
+    and the count after N blinks is read from x^N modulo its characteristic polynomial."""
+    if not (modulus < 2**31 and is_prime(modulus)):
+        raise ValueError(f"Modulus {modulus} must be a prime below 2^31.")
+    states = stone_closure(stones)
+    sequence = count_sequence(stones, states, min(max(blinks) + 1, 2 * len(states)), modulus)
+    if max(blinks) < len(sequence):
+        return {blink: int(sequence[blink]) for blink in blinks}
+    recurrence = berlekamp_massey(sequence, modulus)
+    counts = {}
+    for blink in blinks:
+        if blink < len(sequence):
+            counts[blink] = int(sequence[blink])
+        elif len(recurrence) == 1:
+            counts[blink] = 0
+        else:
+            remainder = power_of_x(blink, recurrence[::-1], modulus)
+            counts[blink] = int((remainder * sequence[: len(remainder)] % modulus).sum() % modulus)
+    return counts
 
 
 def main() -> None:
     """Main function to read input, solve the problem, and display results."""
     content = read_file(r"D:/Project/Advent_Of_Code_2024/day_11/input.txt")
-    print(f"The result of part 1 is : {part_one_and_two(get_data(content), 25)}")
-    print(f"The result of part 2 is : {part_one_and_two(get_data(content), 75)}")
+    counts = counts_at_blinks(get_data(content), [25, 75])
+    print(f"The result of part 1 is : {counts[25]}")
+    print(f"The result of part 2 is : {counts[75]}")
 
 
 if __name__ == "__main__":
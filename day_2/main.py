@@ -41,20 +41,114 @@ def part_one(report_list: list) -> int:
     return sum(is_valid(sublist) for sublist in report_list)
 
 
-def part_two(report_list: list) -> int:
+def is_valid_brute_force(report: list) -> bool:
+    """Checks if removing any one level makes the report valid, trying every removal."""
+    report_array = np.array(report)
+    for i in range(len(report)):
+        if is_valid(np.delete(report_array, i)):
+            return True
+    return False
+
+
+def first_bad_pair(report: list, sign: int) -> int:
+    """Returns the index of the first level whose step to the next one is not between 1 and 3
+    in the direction given by sign (1 increasing, -1 decreasing), or -1 if there is none."""
+    for i in range(len(report) - 1):
+        if not 1 <= sign * (report[i + 1] - report[i]) <= 3:
+            return i
+    return -1
+
+
+def is_valid_linear(report: list) -> bool:
+    """Checks if removing at most one level makes the report valid, in linear time.
+    For each direction, only the two levels of the first bad pair can fix the report,
+    since removing any other level leaves that pair in place."""
+    for sign in (1, -1):
+        i = first_bad_pair(report, sign)
+        if i == -1:
+            return True
+        for k in (i, i + 1):
+            if first_bad_pair(report[:k] + report[k + 1 :], sign) == -1:
+                return True
+    return False
+
+
+DAMPENER_STRATEGIES = {
+    "brute_force": is_valid_brute_force,
+    "linear": is_valid_linear,
+}
+
+
+def part_two(report_list: list, strategy: str = "linear") -> int:
     """Counts the number of sublists where removing one element results in a valid sequence that is strictly increasing or decreasing."""
-    result = 0
-    for sublist in report_list:
-        safe = False
-        sublist_array = np.array(sublist)
-        for i in range(len(sublist)):
-            tmp_sublist = np.delete(sublist_array, i)
-            if is_valid(tmp_sublist):
-                safe = True
-                break
-        if safe:
-            result += 1
-    return result
+    is_safe = DAMPENER_STRATEGIES[strategy]
+    return sum(is_safe(sublist) for sublist in report_list)
+
+
+def group_by_length(report_list: list) -> dict:
+    """Groups the reports by number of levels, each group as a 2D numpy array with one report per row."""
+    groups = {}
+    for report in report_list:
+        groups.setdefault(len(report), []).append(report)
+    return {length: np.array(reports) for length, reports in groups.items()}
+
+
+def are_valid(reports: np.array) -> np.array:
+    """Checks every row of a 2D array of reports at once, returning a boolean per report."""
+    diffs = np.diff(reports, axis=1)
+    is_increasing = np.all((1 <= diffs) & (diffs <= 3), axis=1)
+    is_decreasing = np.all((-3 <= diffs) & (diffs <= -1), axis=1)
+    return is_increasing | is_decreasing
+
+
+def deletion_indexes(length: int) -> np.array:
+    """Returns a (length, length - 1) matrix whose row i lists the levels kept when removing level i."""
+    kept = np.arange(length - 1)
+    return kept[np.newaxis, :] + (kept[np.newaxis, :] >= np.arange(length)[:, np.newaxis])
+
+
+def are_valid_dampened(reports: np.array) -> np.array:
+    """Checks every row of a 2D array of reports at once, allowing one level to be removed."""
+    count, length = reports.shape
+    candidates = reports[:, deletion_indexes(length)].reshape(count * length, length - 1)
+    return are_valid(candidates).reshape(count, length).any(axis=1)
+
+
+def part_one_batch(report_list: list) -> int:
+    """Same as part_one, checking the reports of the same length together."""
+    groups = group_by_length(report_list)
+    return sum(int(np.count_nonzero(are_valid(reports))) for reports in groups.values())
+
+
+def part_two_batch(report_list: list) -> int:
+    """Same as part_two, checking all the removals of the reports of the same length together."""
+    groups = group_by_length(report_list)
+    return sum(
+        int(np.count_nonzero(are_valid_dampened(reports))) for reports in groups.values()
+    )
+
+
+def read_report_chunks(filepath: str, chunk_size: int = 100_000):
+    """Reads a report file lazily and yields lists of at most chunk_size parsed reports."""
+    chunk = []
+    with open(filepath, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                chunk.append(list(map(int, line.split())))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def part_one_and_two_stream(filepath: str, chunk_size: int = 100_000) -> tuple[int, int]:
+    """Solves both parts for a report file too large for memory, one chunk of reports at a time."""
+    result_one, result_two = 0, 0
+    for chunk in read_report_chunks(filepath, chunk_size):
+        result_one += part_one_batch(chunk)
+        result_two += part_two_batch(chunk)
+    return result_one, result_two
 
 
 def main() -> None:
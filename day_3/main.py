@@ -4,7 +4,15 @@ Date : December 3rd, 2024
 Description: Solutions for Day 3 of Advent of Code 2024.
 """
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+MUL_PATTERN = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)")
+INSTRUCTION_PATTERN = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+INSTRUCTION_PATTERN_BYTES = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+# Longest instruction, "mul(999,999)": a match starting further from the end of a chunk is complete.
+MAX_INSTRUCTION_LENGTH = 12
 
 
 def read_file(filepath: str) -> str:
@@ -15,8 +23,7 @@ def read_file(filepath: str) -> str:
 
 def part_one(program: str) -> int:
     """Parses a string for "mul(x,y)" patterns and returns the sum of their products."""
-    regex = "mul\((\d{1,3}),(\d{1,3})\)"
-    matches = re.finditer(regex, program)
+    matches = MUL_PATTERN.finditer(program)
     return sum(int(match.group(1)) * int(match.group(2)) for match in matches)
 
 
@@ -24,8 +31,7 @@ def part_two(program: str) -> int:
     """Parses a string for "mul(x,y)", "do()", and "don't()" patterns,
     computing the sum of enabled products based on the state toggled by "do()" and "don't()".
     """
-    regex = "mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)"
-    matches = re.finditer(regex, program)
+    matches = INSTRUCTION_PATTERN.finditer(program)
     enable = True
     result = 0
     for match in matches:
@@ -40,6 +46,105 @@ def part_two(program: str) -> int:
     return result
 
 
+def read_chunks(file, chunk_size: int = 1 << 20):
+    """Reads a binary file object lazily and yields chunks of at most chunk_size bytes."""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def scan_buffer(buffer: bytes, boundary: int, enable: bool) -> tuple[int, int, bool, int]:
+    """Executes the instructions of buffer starting before boundary. Returns the sums of both
+    parts, the do()/don't() state after them and the position where the last one ended."""
+    result_one, result_two, end = 0, 0, 0
+    for match in INSTRUCTION_PATTERN_BYTES.finditer(buffer):
+        if match.start() >= boundary:
+            break
+        end = match.end()
+        if match.group(0) == b"do()":
+            enable = True
+        elif match.group(0) == b"don't()":
+            enable = False
+        else:
+            product = int(match.group(1)) * int(match.group(2))
+            result_one += product
+            if enable:
+                result_two += product
+    return result_one, result_two, enable, end
+
+
+def scan_chunks(chunks) -> tuple[int, int]:
+    """Computes both parts in a single pass over chunks of bytes. The do()/don't() state is carried
+    from chunk to chunk, and so is the end of each chunk that may hold the start of an instruction."""
+    result_one, result_two = 0, 0
+    enable = True
+    tail = b""
+    for chunk in chunks:
+        buffer = tail + chunk
+        boundary = len(buffer) - MAX_INSTRUCTION_LENGTH + 1
+        one, two, enable, end = scan_buffer(buffer, boundary, enable)
+        result_one, result_two = result_one + one, result_two + two
+        tail = buffer[max(boundary, end) :]
+    one, two, _, _ = scan_buffer(tail, len(tail), enable)
+    return result_one + one, result_two + two
+
+
+def part_one_and_two_stream(filepath: str, chunk_size: int = 1 << 20) -> tuple[int, int]:
+    """Solves both parts for a memory dump of any size, reading it chunk by chunk."""
+    with open(filepath, "rb") as file:
+        return scan_chunks(read_chunks(file, chunk_size))
+
+
+def scan_shard(filepath: str, start: int, end: int) -> tuple:
+    """Scans the instructions starting between the byte offsets start and end of a file, reading a
+    few bytes past end for an instruction straddling it. Since the do()/don't() state at start is
+    unknown, returns the part one sum, then the part two sum and the final state for a shard
+    starting enabled, then the same for a shard starting disabled."""
+    with open(filepath, "rb") as file:
+        file.seek(start)
+        buffer = file.read(end - start + MAX_INSTRUCTION_LENGTH - 1)
+    result_one = 0
+    results_two = {True: 0, False: 0}
+    states = {True: True, False: False}
+    for match in INSTRUCTION_PATTERN_BYTES.finditer(buffer):
+        if match.start() >= end - start:
+            break
+        if match.group(0) == b"do()":
+            states = {True: True, False: True}
+        elif match.group(0) == b"don't()":
+            states = {True: False, False: False}
+        else:
+            product = int(match.group(1)) * int(match.group(2))
+            result_one += product
+            for start_state, enable in states.items():
+                if enable:
+                    results_two[start_state] += product
+    return result_one, results_two[True], states[True], results_two[False], states[False]
+
+
+def part_one_and_two_sharded(
+    filepath: str, workers: int = None, shard_size: int = 1 << 26
+) -> tuple[int, int]:
+    """Solves both parts by scanning shards of the file in a pool of worker processes, then
+    chaining the do()/don't() state through the shards in order to pick each partial sum."""
+    size = os.path.getsize(filepath)
+    starts = list(range(0, size, shard_size))
+    ends = [min(start + shard_size, size) for start in starts]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shards = list(executor.map(scan_shard, [filepath] * len(starts), starts, ends))
+    result_one, result_two = 0, 0
+    enable = True
+    for one, two_enabled, state_enabled, two_disabled, state_disabled in shards:
+        result_one += one
+        if enable:
+            result_two, enable = result_two + two_enabled, state_enabled
+        else:
+            result_two, enable = result_two + two_disabled, state_disabled
+    return result_one, result_two
+
+
 def main() -> None:
     """Main function to read input, solve the problem, and display results."""
     content = read_file("D:/Project/Advent_Of_Code_2024/day_3/input.txt")
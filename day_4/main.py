@@ -6,78 +6,79 @@ Description: Solutions for Day 4 of Advent of Code 2024.
 
 import numpy as np
 
-DIRECTIONS_XMAS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
-DIRECTIONS_X_MAS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-
+from grid import Grid, read_grid
 
-def read_file(filepath: str) -> str:
-    """Reads the content of a file and returns it as a string."""
-    with open(filepath, "r", encoding="utf-8") as file:
-        return file.read()
+DIRECTIONS_XMAS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
 
 
-def string_to_array(content: str) -> np.array:
-    """Converts the string content into a 2D numpy array."""
-    lines = content.split("\n")
-    return np.array([list(line) for line in lines])
+def string_to_grid(content: str) -> Grid:
+    """Converts the content, as str or bytes, into a compact grid."""
+    return Grid.from_text(content)
 
 
-def is_xmas(array: np.array, i: int, j: int, di: int, dj: int) -> bool:
-    """Checks if the sequence "M", "A", "S" appears in the specified direction."""
-    sequence = ["M", "A", "S"]
-    for k in range(1, 4):
-        ni, nj = i + k * di, j + k * dj
-        if not (0 <= ni < array.shape[0] and 0 <= nj < array.shape[1]):
-            return False
-        if array[ni][nj] != sequence[k - 1]:
-            return False
-    return True
+def window(array: np.ndarray, di: int, dj: int, span_i: int, span_j: int) -> np.ndarray:
+    """Returns the cells reached by moving (di, dj) from every start cell of a word, the start
+    cells being those from which a move of (span_i, span_j) stays inside the array."""
+    rows, cols = array.shape
+    lo_i, hi_i = max(0, -span_i), rows - max(0, span_i)
+    lo_j, hi_j = max(0, -span_j), cols - max(0, span_j)
+    return array[lo_i + di : hi_i + di, lo_j + dj : hi_j + dj]
 
 
-def part_one(array: np.array) -> int:
-    """Counts how many times the sequence "X", "M", "A", "S" appears in the array."""
+def count_word(grid: Grid, word: str, directions: list = DIRECTIONS_XMAS) -> int:
+    """Counts the occurrences of word read in each direction, by AND-ing shifted masks
+    of the grid, one per letter."""
+    array = grid.array
+    letters = word.encode()
+    span = len(letters) - 1
     result = 0
-    for i in range(array.shape[0]):
-        for j in range(array.shape[1]):
-            if array[i][j] == "X":
-                for di, dj in DIRECTIONS_XMAS:
-                    if is_xmas(array, i, j, di, dj):
-                        result += 1
+    for di, dj in directions:
+        if not (abs(span * di) < array.shape[0] and abs(span * dj) < array.shape[1]):
+            continue
+        match = window(array, 0, 0, span * di, span * dj) == letters[0]
+        for k in range(1, len(letters)):
+            match &= window(array, k * di, k * dj, span * di, span * dj) == letters[k]
+        result += int(np.count_nonzero(match))
     return result
 
 
-def is_x_mas(array: np.array, i: int, j: int) -> bool:
-    """Checks if there is a valid pattern of "M", "A", "S" around a given "A"."""
-    letters = []
-    for direction in DIRECTIONS_X_MAS:
-        ni, nj = i + direction[0], j + direction[1]
-        if 0 <= ni < array.shape[0] and 0 <= nj < array.shape[1]:
-            if array[ni][nj] == "M" or array[ni][nj] == "S":
-                letters.append(array[ni][nj])
-    return (
-        letters.count("M") == 2
-        and letters.count("S") == 2
-        and letters[0] != letters[-1]
-    )
+def count_crossed_word(grid: Grid, word: str = "MAS") -> int:
+    """Counts the cells at the center of two diagonals that both read word, forwards or
+    backwards. The word must have an odd length so that its middle letter is the center."""
+    array = grid.array
+    letters = word.encode()
+    rows, cols = array.shape
+    half = len(letters) // 2
+    if rows < len(letters) or cols < len(letters):
+        return 0
+    crossed = np.ones((rows - 2 * half, cols - 2 * half), dtype=bool)
+    for dj in (1, -1):
+        forward = np.ones_like(crossed)
+        backward = np.ones_like(crossed)
+        for k, letter in enumerate(letters):
+            oi, oj = k - half, (k - half) * dj
+            cells = array[half + oi : rows - half + oi, half + oj : cols - half + oj]
+            forward &= cells == letter
+            backward &= cells == letters[-1 - k]
+        crossed &= forward | backward
+    return int(np.count_nonzero(crossed))
 
 
-def part_two(array: str) -> int:
-    """Counts how many times the pattern "M", "A", "S" appears around an "A" in the array."""
-    result = 0
-    for i in range(array.shape[0]):
-        for j in range(array.shape[1]):
-            if array[i][j] == "A":
-                if is_x_mas(array, i, j):
-                    result += 1
-    return result
+def part_one(grid: Grid) -> int:
+    """Counts how many times the sequence "X", "M", "A", "S" appears in the grid."""
+    return count_word(grid, "XMAS")
+
+
+def part_two(grid: Grid) -> int:
+    """Counts how many times the pattern "M", "A", "S" appears around an "A" in the grid."""
+    return count_crossed_word(grid, "MAS")
 
 
 def main() -> None:
     """Main function to read input, solve the problem, and display results."""
-    content = read_file("D:/Project/Advent_Of_Code_2024/day_4/input.txt")
-    array = string_to_array(content)
-    print(f"The result of part 1 is : {part_one(array)}")
-    print(f"The result of part 2 is : {part_two(array)}")
+    grid = read_grid("D:/Project/Advent_Of_Code_2024/day_4/input.txt")
+    print(f"The result of part 1 is : {part_one(grid)}")
+    print(f"The result of part 2 is : {part_two(grid)}")
 
 
 if __name__ == "__main__":
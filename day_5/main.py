@@ -4,6 +4,14 @@ Date : December 5th, 2024
 Description: Solutions for Day 5 of Advent of Code 2024.
 """
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Rule matrix shared by the tasks of a worker process, set by init_rule_worker.
+RULE_STATE = {}
+
 
 def read_file(filepath: str) -> str:
     """Reads the content of a file and returns it as a string."""
@@ -25,47 +33,151 @@ def split_sections(content: str) -> tuple[dict, list]:
     return rules_dict, manuals
 
 
+def build_precedence(rules_dict: dict) -> dict:
+    """Maps each page number to the bitset of the page numbers that must be printed after it."""
+    precedence = {}
+    for left, rights in rules_dict.items():
+        successors = 0
+        for right in rights:
+            successors |= 1 << int(right)
+        precedence[int(left)] = successors
+    return precedence
+
+
+def is_ordered(precedence: dict, pages: list) -> bool:
+    """Checks in one pass that no page has to be printed before a page already seen."""
+    seen = 0
+    for page in pages:
+        if precedence.get(page, 0) & seen:
+            return False
+        seen |= 1 << page
+    return True
+
+
+def reorder(precedence: dict, pages: list) -> list:
+    """Returns the pages sorted with Kahn's algorithm on the rules between the pages of the manual,
+    leaving the given list untouched. Pages free at the same time keep their original order."""
+    successors = {
+        page: [other for other in pages if precedence.get(page, 0) >> other & 1]
+        for page in pages
+    }
+    in_degree = dict.fromkeys(pages, 0)
+    for page in pages:
+        for other in successors[page]:
+            in_degree[other] += 1
+    ready = deque(page for page in pages if in_degree[page] == 0)
+    ordered = []
+    while ready:
+        page = ready.popleft()
+        ordered.append(page)
+        for other in successors[page]:
+            in_degree[other] -= 1
+            if in_degree[other] == 0:
+                ready.append(other)
+    if len(ordered) != len(pages):
+        raise ValueError(f"The rules contain a cycle between the pages {pages}.")
+    return ordered
+
+
 def part_one(rules_dict: dict, manuals: list) -> int:
     """Calculates the sum of the middle elements of valid manuals based on the rules."""
+    precedence = build_precedence(rules_dict)
     result = 0
     for manual in manuals:
-        safe = True
-        for i in range(len(manual)):
-            if manual[i] in rules_dict:
-                val_from_dict = rules_dict[manual[i]]
-                beginning_manual = manual[:i]
-                if set(beginning_manual).intersection(set(val_from_dict)):
-                    safe = False
-                    break
-        if safe:
-            result += int(manual[len(manual) // 2])
+        pages = [int(page) for page in manual]
+        if is_ordered(precedence, pages):
+            result += pages[len(pages) // 2]
     return result
 
 
 def part_two(rules_dict: dict, manuals: list) -> int:
-    """Processes manuals with rule-based validation and calculates a result."""
+    """Calculates the sum of the middle elements of the invalid manuals once correctly ordered,
+    without modifying the manuals."""
+    precedence = build_precedence(rules_dict)
     result = 0
     for manual in manuals:
-        safe = True
-        for _ in range(4):
-            for elem in manual:
-                if elem in rules_dict:
-                    val_from_dict = rules_dict[elem]
-                    beginning_manual = manual[: manual.index(elem)]
-                    common_page = [
-                        page for page in beginning_manual if page in val_from_dict
-                    ]
-                    if common_page:
-                        safe = False
-                        val = manual.index(elem)
-                        for k in range(len(common_page)):
-                            manual.remove(common_page[k])
-                            manual.insert(val + k, common_page[k])
-        if not safe:
-            result += int(manual[len(manual) // 2])
+        pages = [int(page) for page in manual]
+        if not is_ordered(precedence, pages):
+            result += reorder(precedence, pages)[len(pages) // 2]
     return result
 
 
+def build_rule_matrix(rules_dict: dict) -> np.ndarray:
+    """Builds the dense boolean adjacency matrix of the rules: entry (a, b) is True when page a
+    must be printed before page b. Page numbers index the matrix directly."""
+    lefts = [int(left) for left, rights in rules_dict.items() for _ in rights]
+    rights = [int(right) for rights in rules_dict.values() for right in rights]
+    size = max(lefts + rights, default=0) + 1
+    matrix = np.zeros((size, size), dtype=bool)
+    matrix[lefts, rights] = True
+    return matrix
+
+
+def precedence_from_matrix(matrix: np.ndarray) -> dict:
+    """Converts the rule matrix back into the bitsets used by reorder."""
+    return {
+        page: sum(1 << int(other) for other in np.flatnonzero(row))
+        for page, row in enumerate(matrix)
+        if row.any()
+    }
+
+
+def check_manuals(matrix: np.ndarray, manuals: list) -> tuple[int, int]:
+    """Returns the sum of the middle pages of the valid manuals and of the invalid ones once
+    ordered, processing the manuals of the same length together.
+
+    A manual is valid when no pair of positions i < j has a rule forcing page j before page i.
+    When the rules order all the pages of a manual, the rank of a page is the number of its pages
+    that must come before it; otherwise the manual is ordered with Kahn's algorithm."""
+    groups = {}
+    for manual in manuals:
+        groups.setdefault(len(manual), []).append(manual)
+    result_one, result_two = 0, 0
+    for length, group in groups.items():
+        pages = np.array(group).astype(np.int64)
+        if pages.size and pages.max() >= matrix.shape[0]:
+            matrix = np.pad(matrix, (0, int(pages.max()) + 1 - matrix.shape[0]))
+        before, after = np.triu_indices(length, 1)
+        valid = ~matrix[pages[:, after], pages[:, before]].any(axis=1)
+        result_one += int(pages[valid, length // 2].sum())
+
+        invalid = pages[~valid]
+        ranks = matrix[invalid[:, :, np.newaxis], invalid[:, np.newaxis, :]].sum(axis=1)
+        total = (np.sort(ranks, axis=1) == np.arange(length)).all(axis=1)
+        result_two += int(invalid[total][ranks[total] == length // 2].sum())
+        if not total.all():
+            precedence = precedence_from_matrix(matrix)
+            for manual in invalid[~total].tolist():
+                result_two += reorder(precedence, manual)[length // 2]
+    return result_one, result_two
+
+
+def init_rule_worker(matrix: np.ndarray) -> None:
+    """Keeps the rule matrix once per worker process."""
+    RULE_STATE["matrix"] = matrix
+
+
+def check_manuals_in_worker(manuals: list) -> tuple[int, int]:
+    """Checks one chunk of manuals with the rule matrix of the worker process."""
+    return check_manuals(RULE_STATE["matrix"], manuals)
+
+
+def part_one_and_two_vectorized(
+    rules_dict: dict, manuals: list, workers: int = 1, chunk_size: int = 10_000
+) -> tuple[int, int]:
+    """Solves both parts with the rule matrix, splitting the manuals in chunks across a pool of
+    worker processes when workers > 1."""
+    matrix = build_rule_matrix(rules_dict)
+    if workers <= 1:
+        return check_manuals(matrix, manuals)
+    chunks = [manuals[i : i + chunk_size] for i in range(0, len(manuals), chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_rule_worker, initargs=(matrix,)
+    ) as executor:
+        results = list(executor.map(check_manuals_in_worker, chunks))
+    return sum(result[0] for result in results), sum(result[1] for result in results)
+
+
 def main() -> None:
     """Main function to read input, solve the problem, and display results."""
     content = read_file(r"D:/Project/Advent_Of_Code_2024/day_5/input.txt")
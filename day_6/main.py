@@ -4,8 +4,10 @@ Date : December 6th, 2024
 Description: Solutions for Day 6 of Advent of Code 2024.
 """
 
-import numpy as np
-from collections import Counter
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+from grid import Grid, read_grid
 
 DIRECTIONS = {
     "^": (-1, 0),
@@ -21,52 +23,24 @@ ROTATION = {
     "<": "^",
 }
 
-
-def read_file(filepath: str) -> str:
-    """Reads the content of a file and returns it as a string."""
-    with open(filepath, "r", encoding="utf-8") as file:
-        return file.read()
+# State of the map shared by the tasks of a worker process, set by init_loop_worker.
+LOOP_STATE = {}
 
 
-def string_to_array(content: str) -> np.array:
-    """Converts the string content into a 2D numpy array."""
-    lines = content.split("\n")
-    return np.array([list(line) for line in lines])
+def string_to_grid(content: str) -> Grid:
+    """Converts the content, as str or bytes, into a compact grid."""
+    return Grid.from_text(content)
 
 
-def find_guard_position(map: np.array) -> tuple:
+def find_guard_position(map: Grid) -> tuple:
     """Finds the position of the guard on the map."""
-    for i, row in enumerate(map):
-        for j, cell in enumerate(row):
-            if cell in "^>v<":
-                return (i, j)
+    return map.positions("^>v<")[0]
 
 
-def find_guard_direction(map: np.array, guard_pos: tuple) -> str:
+def find_guard_direction(map: Grid, guard_pos: tuple) -> str:
     """Returns the direction of the guard at the given position."""
     x, y = guard_pos
-    return map[x, y]
-
-
-def is_obstacle_in_front(map: np.array, guard_pos: tuple, guard_dir: str) -> bool:
-    """Checks if there is an obstacle in front of the guard."""
-    x, y = guard_pos
-
-    if guard_dir == "^":
-        next_pos = (x - 1, y)
-    elif guard_dir == ">":
-        next_pos = (x, y + 1)
-    elif guard_dir == "v":
-        next_pos = (x + 1, y)
-    elif guard_dir == "<":
-        next_pos = (x, y - 1)
-    else:
-        raise ValueError(f"Direction {guard_dir} non valide.")
-
-    if 0 <= next_pos[0] < map.shape[0] and 0 <= next_pos[1] < map.shape[1]:
-        return map[next_pos[0], next_pos[1]] == "#"
-    else:
-        return False
+    return map.char(x, y)
 
 
 def change_guard_direction(guard_dir: str) -> str:
@@ -74,56 +48,179 @@ def change_guard_direction(guard_dir: str) -> str:
     return ROTATION[guard_dir]
 
 
-def move_guard(map, guard_pos: tuple, guard_dir: str) -> tuple:
-    """Moves the guard in the current direction and returns the new position."""
-    dx, dy = DIRECTIONS[guard_dir]
-    new_guard_pos = (guard_pos[0] + dx, guard_pos[1] + dy)
-    if 0 <= new_guard_pos[0] < map.shape[0] and 0 <= new_guard_pos[1] < map.shape[1]:
-        return new_guard_pos
+def build_obstacle_index(map: Grid) -> tuple[list, list]:
+    """Lists the obstacles of the map as the sorted columns of the obstacles of each row,
+    and the sorted rows of the obstacles of each column."""
+    rows, cols = map.shape
+    mask = map.mask("#")
+    by_row = [[] for _ in range(rows)]
+    for i, j in zip(*(index.tolist() for index in mask.nonzero())):
+        by_row[i].append(j)
+    by_col = [[] for _ in range(cols)]
+    for j, i in zip(*(index.tolist() for index in mask.T.nonzero())):
+        by_col[j].append(i)
+    return by_row, by_col
+
+
+def next_stop(
+    obstacles: tuple, shape: tuple, position: int, guard_dir: str, obstacle: int = None
+) -> int:
+    """Returns the cell (as a flat index row * cols + col) where the guard stops when walking
+    from position: just before the next obstacle of its row or column, found by bisection,
+    or on the edge of the map. An extra obstacle is taken into account when given."""
+    rows, cols = shape
+    i, j = divmod(position, cols)
+    if guard_dir in "^v":
+        line, k, size = obstacles[1][j], i, rows
+        extra = obstacle // cols if obstacle is not None and obstacle % cols == j else None
     else:
-        return False
-
-
-def part_one(map: np.array, guard_pos: tuple) -> list:
-    """Calculates the guard's path and returns distinct positions visited."""
-    visited_position = [guard_pos]
-    dir = find_guard_direction(map, guard_pos)
+        line, k, size = obstacles[0][i], j, cols
+        extra = obstacle % cols if obstacle is not None and obstacle // cols == i else None
+    index = bisect_left(line, k)
+    if guard_dir in "^<":
+        block = line[index - 1] if index else -1
+        if extra is not None and block < extra < k:
+            block = extra
+        stop = block + 1
+    else:
+        block = line[index] if index < len(line) else size
+        if extra is not None and k < extra < block:
+            block = extra
+        stop = block - 1
+    return stop * cols + j if guard_dir in "^v" else i * cols + stop
+
+
+def is_leaving(shape: tuple, position: int, guard_dir: str) -> bool:
+    """Checks if the guard leaves the map when stepping forward from position."""
+    rows, cols = shape
+    i, j = divmod(position, cols)
+    return (
+        (guard_dir == "^" and i == 0)
+        or (guard_dir == "v" and i == rows - 1)
+        or (guard_dir == "<" and j == 0)
+        or (guard_dir == ">" and j == cols - 1)
+    )
+
+
+def simulate(
+    obstacles: tuple, shape: tuple, position: int, guard_dir: str, obstacle: int = None
+) -> tuple[list, bool]:
+    """Jumps the guard from obstacle to obstacle and returns the stops reached with the
+    direction used to reach them, and whether the guard ends up in a loop."""
+    stops = [(position, guard_dir)]
+    states = set()
     while True:
-        object_front = is_obstacle_in_front(map, guard_pos, dir)
-        if not object_front:
-            guard_pos = move_guard(map, guard_pos, dir)
-            if not guard_pos:
-                break
-            visited_position.append(guard_pos)
-            count = Counter(visited_position)
-            if any(value >= 5 for value in count.values()):
-                return False
-        else:
-            dir = change_guard_direction(dir)
-    return list(set(visited_position))
-
-
-def part_two(map: np.array, visited_position: list) -> int:
-    """Calculate how many blocks the guard can lead in an infinite loop"""
-    result = 0
-    for coord in visited_position:
-        guard_pos = find_guard_position(map)
-        map_copy = map.copy()
-        if map_copy[coord[0]][coord[1]] != "^":
-            map_copy[coord[0]][coord[1]] = "#"
-        if part_one(map_copy, guard_pos) is False:
-            result += 1
-    return result
+        position = next_stop(obstacles, shape, position, guard_dir, obstacle)
+        stops.append((position, guard_dir))
+        if is_leaving(shape, position, guard_dir):
+            return stops, False
+        if (position, guard_dir) in states:
+            return stops, True
+        states.add((position, guard_dir))
+        guard_dir = change_guard_direction(guard_dir)
+
+
+def walk(obstacles: tuple, shape: tuple, position: int, guard_dir: str) -> tuple[list, bool]:
+    """Returns the ordered trajectory of the guard, one (position, direction) per step with
+    the direction the guard was moving in when entering the cell, and whether it loops."""
+    cols = shape[1]
+    stops, loop = simulate(obstacles, shape, position, guard_dir)
+    trajectory = [stops[0]]
+    for (start, _), (end, dir) in zip(stops, stops[1:]):
+        dx, dy = DIRECTIONS[dir]
+        step = dx * cols + dy
+        trajectory.extend((position, dir) for position in range(start + step, end + step, step))
+    return trajectory, loop
+
+
+def first_visit_states(trajectory: list) -> dict:
+    """Maps each cell of the trajectory but the starting one to the state of the guard just
+    before it first enters it: the previous position and the direction it is moving in."""
+    states = {trajectory[0][0]: None}
+    for (previous, _), (position, dir) in zip(trajectory, trajectory[1:]):
+        if position not in states:
+            states[position] = (previous, dir)
+    del states[trajectory[0][0]]
+    return states
+
+
+def loop_state(map: Grid, guard_pos: tuple) -> dict:
+    """Gathers what is needed to walk the guard and test candidate obstacles: the obstacle
+    index, the map shape and the starting state of the guard."""
+    return {
+        "obstacles": build_obstacle_index(map),
+        "shape": map.shape,
+        "start": guard_pos[0] * map.shape[1] + guard_pos[1],
+        "dir": find_guard_direction(map, guard_pos),
+    }
+
+
+def walk_guard(map: Grid, guard_pos: tuple) -> tuple[list, list, dict]:
+    """Walks the guard once and returns the distinct positions visited in order of first visit
+    (or False if the guard loops), with the ordered trajectory and the loop state used to
+    compute it, so that part_two can reuse both."""
+    state = loop_state(map, guard_pos)
+    trajectory, loop = walk(state["obstacles"], state["shape"], state["start"], state["dir"])
+    if loop:
+        return False, trajectory, state
+    cols = map.shape[1]
+    cells = list(dict.fromkeys(divmod(position, cols) for position, _ in trajectory))
+    return cells, trajectory, state
+
+
+def part_one(map: Grid, guard_pos: tuple) -> list:
+    """Calculates the guard's path and returns distinct positions visited, in order of first visit."""
+    return walk_guard(map, guard_pos)[0]
+
+
+def count_loops(candidates: list, state: dict) -> int:
+    """Counts the candidate obstacles that lead the guard into a loop. Each candidate is a
+    flat index with the state to resume the walk from, just before the guard first hits it."""
+    obstacles, shape = state["obstacles"], state["shape"]
+    return sum(
+        simulate(obstacles, shape, position, dir, obstacle)[1]
+        for obstacle, position, dir in candidates
+    )
+
+
+def init_loop_worker(state: dict) -> None:
+    """Stores the state built by the parent once per worker process, the obstacle index
+    being small enough to send as is."""
+    LOOP_STATE.update(state)
+
+
+def count_loops_in_worker(candidates: list) -> int:
+    """Counts the looping candidates of one chunk with the state of the worker process."""
+    return count_loops(candidates, LOOP_STATE)
+
+
+def part_two(map: Grid, walked: tuple = None, workers: int = 1, chunk_size: int = 256) -> int:
+    """Calculate how many blocks the guard can lead in an infinite loop, splitting the
+    candidates in chunks across a pool of worker processes when workers > 1.
+    Reuses the trajectory and loop state of walk_guard when given, and walks the guard
+    otherwise. The walk of each candidate resumes from where the guard first meets it
+    instead of restarting from the guard's origin, since the path is unchanged up to that point."""
+    if walked is None:
+        walked = walk_guard(map, find_guard_position(map))
+    _, trajectory, state = walked
+    candidates = [
+        (obstacle, *resume) for obstacle, resume in first_visit_states(trajectory).items()
+    ]
+    if workers <= 1:
+        return count_loops(candidates, state)
+    chunks = [candidates[i : i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_loop_worker, initargs=(state,)
+    ) as executor:
+        return sum(executor.map(count_loops_in_worker, chunks))
 
 
 def main() -> None:
     """Main function to read input, solve the problem, and display results."""
-    content = read_file(r"D:/Project/Advent_Of_Code_2024/day_6/input.txt")
-    map = string_to_array(content)
-    guard_pos = find_guard_position(map)
-    part_one_res = part_one(map.copy(), guard_pos)
-    print(f"The result of part 1 is : {len(part_one_res)}")
-    print(f"The result of part 2 is : {part_two(map.copy(), part_one_res)}")
+    map = read_grid(r"D:/Project/Advent_Of_Code_2024/day_6/input.txt")
+    walked = walk_guard(map, find_guard_position(map))
+    print(f"The result of part 1 is : {len(walked[0])}")
+    print(f"The result of part 2 is : {part_two(map, walked)}")
 
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ Description: Solutions for Day 7 of Advent of Code 2024.
 """
 
 import re
-from itertools import product
+from concurrent.futures import ProcessPoolExecutor
 
 
 OPERATORS_1 = ["+", "*"]
@@ -27,31 +27,168 @@ def get_data(content: str) -> tuple[list, list]:
     return test_values, remaining_number
 
 
-def left_right_calculation(data: tuple[list, list], combination: tuple) -> int:
-    """Calculates the result of an expression by applying operators from left to right."""
-    result = data[0]
-    for i in range(1, len(data)):
-        if combination[i - 1] == "+":
-            result += data[i]
-        elif combination[i - 1] == "*":
-            result *= data[i]
-        elif combination[i - 1] == "||":
-            result = int(str(result) + str(data[i]))
-    return result
+def next_power_of_ten(number: int) -> int:
+    """Returns the smallest power of ten above number, the factor used to concatenate it."""
+    power = 10
+    while power <= number:
+        power *= 10
+    return power
+
+
+def add(left: int, right: int) -> int:
+    """Returns left + right."""
+    return left + right
+
+
+def multiply(left: int, right: int) -> int:
+    """Returns left * right."""
+    return left * right
+
+
+def concatenate(left: int, right: int) -> int:
+    """Returns the number made of the digits of left followed by the digits of right."""
+    return left * next_power_of_ten(right) + right
+
+
+# Returned by an inverse when any left operand gives the target, as when multiplying by zero.
+ANY_OPERAND = "any"
+
+
+def undo_addition(target: int, number: int) -> int:
+    """Returns the left operand giving target when number is added, or None if negative."""
+    return target - number if target >= number else None
+
+
+def undo_multiplication(target: int, number: int) -> int:
+    """Returns the left operand giving target when multiplied by number, None if it does not
+    divide, or ANY_OPERAND when both are zero."""
+    if number == 0:
+        return ANY_OPERAND if target == 0 else None
+    return target // number if target % number == 0 else None
+
+
+def undo_concatenation(target: int, number: int) -> int:
+    """Returns the left operand giving target when number is concatenated, or None if target
+    does not end with the digits of number."""
+    power = next_power_of_ten(number)
+    return target // power if target % power == number else None
+
 
+# For each operator symbol: the function applying it, and the function undoing it (or None)
+# returning the left operand for a given result and right operand, None if there is none,
+# or ANY_OPERAND if every left operand works.
+OPERATOR_REGISTRY = {
+    "+": {"forward": add, "inverse": undo_addition},
+    "*": {"forward": multiply, "inverse": undo_multiplication},
+    "||": {"forward": concatenate, "inverse": undo_concatenation},
+}
 
-def part_one_and_two(data: tuple[list, list], operator: list) -> int:
-    """Calculates the sum of test values that match a left-to-right calculation."""
+
+def register_operator(symbol: str, forward, inverse=None) -> None:
+    """Adds an operator to the registry. Without an inverse, equations using it are solved
+    forward, without pruning."""
+    OPERATOR_REGISTRY[symbol] = {"forward": forward, "inverse": inverse}
+
+
+def resolve_operators(operator: list) -> list:
+    """Looks up operator symbols in the registry and returns them as (symbol, forward, inverse)
+    tuples, which worker processes can use without the registry of this process."""
+    return [
+        (op, OPERATOR_REGISTRY[op]["forward"], OPERATOR_REGISTRY[op]["inverse"])
+        for op in operator
+    ]
+
+
+def unroll(path: tuple) -> list:
+    """Returns the operators of a path stored as nested (operator, rest) pairs, in order."""
+    combination = []
+    while path:
+        op, path = path
+        combination.append(op)
+    return combination
+
+
+def find_operators(test_value: int, equation: list, operator: list) -> list:
+    """Returns a sequence of the operator symbols making the equation give the test value, or None."""
+    return search_operators(test_value, equation, resolve_operators(operator))
+
+
+def search_operators(test_value: int, equation: list, operators: list) -> list:
+    """Works backward from the test value, undoing the last operation at each step and pruning
+    the operators that cannot be undone. Falls back to a forward search when an operator has no
+    inverse. Both searches are depth-first with an explicit stack and skip the (value, position)
+    states already seen. Takes resolved operators and returns the matching symbols, or None."""
+    inverses = [(op, inverse) for op, _, inverse in operators]
+    forwards = [(op, forward) for op, forward, _ in operators]
+    seen = set()
+
+    if all(inverse is not None for _, inverse in inverses):
+        # Each path holds the operators after position k, the next one first.
+        stack = [(test_value, len(equation) - 1, ())]
+        while stack:
+            target, k, path = stack.pop()
+            if k == 0:
+                if target == equation[0]:
+                    return unroll(path)
+                continue
+            if (target, k) in seen:
+                continue
+            seen.add((target, k))
+            for op, inverse in reversed(inverses):
+                previous = inverse(target, equation[k])
+                if previous == ANY_OPERAND:
+                    return [operators[0][0]] * (k - 1) + unroll((op, path))
+                if previous is not None:
+                    stack.append((previous, k - 1, (op, path)))
+        return None
+
+    # Each path holds the operators before position k, the last one first.
+    stack = [(equation[0], 1, ())]
+    while stack:
+        value, k, path = stack.pop()
+        if k == len(equation):
+            if value == test_value:
+                return unroll(path)[::-1]
+            continue
+        if (value, k) in seen:
+            continue
+        seen.add((value, k))
+        for op, forward in reversed(forwards):
+            stack.append((forward(value, equation[k]), k + 1, (op, path)))
+    return None
+
+
+def sum_matching(test_values: list, equations: list, operators: list) -> int:
+    """Sums the test values of the equations that can be made true with the resolved operators."""
     result = 0
-    for test_value, equation in zip(data[0], data[1]):
-        combinations = list(product(operator, repeat=len(equation) - 1))
-        for combination in combinations:
-            if test_value == left_right_calculation(equation, combination):
-                result += test_value
-                break
+    for test_value, equation in zip(test_values, equations):
+        if search_operators(test_value, equation, operators) is not None:
+            result += test_value
     return result
 
 
+def part_one_and_two(
+    data: tuple[list, list], operator: list, workers: int = 1, batch_size: int = 1000
+) -> int:
+    """Calculates the sum of test values that match a left-to-right calculation, fanning
+    batches of equations out to a pool of worker processes when workers > 1. The operators
+    are sent to the workers as functions, which must be importable from their module."""
+    test_values, equations = data
+    operators = resolve_operators(operator)
+    if workers <= 1:
+        return sum_matching(test_values, equations, operators)
+    starts = range(0, len(equations), batch_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(
+            executor.map(
+                sum_matching,
+                [test_values[i : i + batch_size] for i in starts],
+                [equations[i : i + batch_size] for i in starts],
+                [operators] * len(starts),
+            )
+        )
+
+
 def main() -> None:
     """Main function to read input, solve the problem, and display results."""
     content = read_file(r"D:/Project/Advent_Of_Code_2024/day_7/input.txt")
@@ -4,33 +4,19 @@ Date : December 8th, 2024
 Description: Solutions for Day 8 of Advent of Code 2024.
 """
 
-import numpy as np
 from itertools import combinations
 
+from grid import ALPHANUMERIC, Grid, read_grid
 
-def read_file(filepath: str) -> str:
-    """Reads the content of a file and returns it as a string."""
-    with open(filepath, "r", encoding="utf-8") as file:
-        return file.read()
 
+def string_to_grid(content: str) -> Grid:
+    """Converts the content, as str or bytes, into a compact grid."""
+    return Grid.from_text(content)
 
-def string_to_array(content: str) -> np.array:
-    """Converts the string content into a 2D numpy array."""
-    lines = content.splitlines()
-    return np.array([list(line) for line in lines])
 
-
-def find_antennas_position(map: np.array) -> dict:
+def find_antennas_position(map: Grid) -> dict:
     """Finds and returns the positions of antennas in the given map as a dictionary."""
-    antennas = {}
-    for i in range(map.shape[0]):
-        for j in range(map.shape[1]):
-            char = str(map[i, j])
-            if char.isalnum():
-                if char not in antennas:
-                    antennas[char] = []
-                antennas[char].append((i, j))
-    return antennas
+    return map.group_positions(ALPHANUMERIC)
 
 
 def get_antenna_pairs(positions: list) -> list:
@@ -43,7 +29,7 @@ def is_within_bounds(antinode: tuple, bounds: tuple) -> bool:
     return 0 <= antinode[0] < bounds[0] and 0 <= antinode[1] < bounds[1]
 
 
-def part_one(map: np.array) -> int:
+def part_one(map: Grid) -> int:
     """Calculates and returns the number of unique antinode positions."""
     antennas = find_antennas_position(map)
     bounds = map.shape
@@ -67,7 +53,7 @@ def part_one(map: np.array) -> int:
     return len(antinode_positions)
 
 
-def part_two(map: np.array) -> int:
+def part_two(map: Grid) -> int:
     """Calculates and returns the number of unique antinode positions."""
     antennas = find_antennas_position(map)
     bounds = map.shape
@@ -99,8 +85,7 @@ def part_two(map: np.array) -> int:
 
 def main() -> None:
     """Main function to read input, solve the problem, and display results."""
-    content = read_file(r"D:/Project/Advent_Of_Code_2024/day_8/input.txt")
-    map = string_to_array(content)
+    map = read_grid(r"D:/Project/Advent_Of_Code_2024/day_8/input.txt")
     print(f"The result of part 1 is : {part_one(map)}")
     print(f"The result of part 2 is : {part_two(map)}")
 
@@ -4,6 +4,10 @@ Date : December 9th, 2024
 Description: Solutions for Day 9 of Advent of Code 2024.
 """
 
+import heapq
+
+import numpy as np
+
 
 def read_file(filepath: str) -> str:
     """Reads the content of a file and returns it as a string."""
@@ -11,70 +15,181 @@ def read_file(filepath: str) -> str:
         return file.read()
 
 
-def get_individual_blocks(content: str) -> list:
-    """Generates a disk map with individual blocks based on the input string content."""
-    map = []
-    for i in range(len(content)):
+def parse_disk_map(content: str) -> tuple[list, list]:
+    """Parses the dense disk map into file spans and free spans, as (start, length) lists,
+    the file ID being the index of its span. Free spans only separated by zero-length files
+    are merged, as their blocks are contiguous on the disk."""
+    files, free_spans = [], []
+    position = 0
+    for i, digit in enumerate(content.strip()):
+        length = int(digit)
         if i % 2 == 0:
-            for _ in range(int(content[i])):
-                map.append(str(i // 2))
+            files.append((position, length))
+        elif free_spans and sum(free_spans[-1]) == position:
+            free_spans[-1] = (free_spans[-1][0], free_spans[-1][1] + length)
+        elif length:
+            free_spans.append((position, length))
+        position += length
+    return files, free_spans
+
+
+def compact_files(files: list, free_spans: list) -> list:
+    """Moves each whole file, by descending file ID, to the leftmost free span that fits it.
+    Free spans are kept in one min-heap of (start, length) per span length from 1 to 9, the
+    last one also holding the longer spans, so the leftmost fitting span is the smallest head
+    among the heaps of lengths >= the file size."""
+    heaps = [[] for _ in range(10)]
+    for start, length in free_spans:
+        heaps[min(length, 9)].append((start, length))
+    for heap in heaps:
+        heapq.heapify(heap)
+
+    moved = list(files)
+    for file_id in range(len(files) - 1, -1, -1):
+        file_start, file_size = files[file_id]
+        if not file_size:
+            continue
+        best_heap, best_start = 0, file_start
+        for length in range(file_size, 10):
+            if heaps[length] and heaps[length][0][0] < best_start:
+                best_heap, best_start = length, heaps[length][0][0]
+        if best_heap:
+            _, length = heapq.heappop(heaps[best_heap])
+            if length > file_size:
+                remaining = length - file_size
+                heapq.heappush(heaps[min(remaining, 9)], (best_start + file_size, remaining))
+            moved[file_id] = (best_start, file_size)
+    return moved
+
+
+def span_index_sum(start: int, length: int) -> int:
+    """Returns the sum of the block positions start, start + 1, ..., start + length - 1."""
+    return start * length + length * (length - 1) // 2
+
+
+def checksum_spans(files: list) -> int:
+    """Calculates the checksum straight from the (start, length) span of each file ID."""
+    return sum(
+        file_id * span_index_sum(start, length) for file_id, (start, length) in enumerate(files)
+    )
+
+
+def checksum_compacted_blocks(content: str) -> int:
+    """Calculates the checksum of the disk compacted block by block without building it: a left
+    pointer walks the disk map forward while a right pointer takes blocks from the last files
+    to fill each free span, adding each run of blocks to the checksum as it is placed."""
+    end = len(content)
+    while end and not content[end - 1].isdigit():
+        end -= 1
+    left, right = 0, end - 1
+    if right % 2:
+        right -= 1
+    remaining = int(content[right]) if right >= 0 else 0
+    position, checksum = 0, 0
+    while left < right:
+        length = int(content[left])
+        if left % 2 == 0:
+            checksum += (left // 2) * span_index_sum(position, length)
+            position += length
         else:
-            for _ in range(int(content[i])):
-                map.append(".")
-    return map
-
-
-def rearrange_disk_1(map: list) -> list:
-    """Rearranges the disk map by moving digits to the leftmost available positions for dots."""
-    dot_list = [i for i, val in enumerate(map) if val == "."]
-    num_list = [i for i, val in enumerate(map) if val.isdigit()]
-    while dot_list and num_list:
-        dot_index = dot_list.pop(0)
-        num_index = num_list.pop()
-        if dot_index < num_index:
-            map[dot_index] = map[num_index]
-            map[num_index] = "."
+            while length and left < right:
+                moved = min(length, remaining)
+                checksum += (right // 2) * span_index_sum(position, moved)
+                position += moved
+                length -= moved
+                remaining -= moved
+                if not remaining:
+                    right -= 2
+                    remaining = int(content[right]) if right > left else 0
+        left += 1
+    if left == right:
+        checksum += (right // 2) * span_index_sum(position, remaining)
+    return checksum
+
+
+def get_block_image(content: str) -> np.ndarray:
+    """Generates the disk map as an int32 array with the file ID of each block, -1 for free blocks."""
+    lengths = np.frombuffer(content.strip().encode(), dtype=np.uint8) - ord("0")
+    values = np.arange(len(lengths), dtype=np.int32) // 2
+    values[1::2] = -1
+    return np.repeat(values, lengths)
+
+
+def rearrange_image_1(image: np.ndarray) -> np.ndarray:
+    """Moves file blocks from the end of the image to the leftmost free blocks, in place.
+    Free blocks are taken in increasing order and file blocks in decreasing order, each pair
+    being swapped while the free block is before the file block."""
+    free = np.flatnonzero(image == -1)
+    used = np.flatnonzero(image != -1)[::-1]
+    count = min(len(free), len(used))
+    moves = int(np.count_nonzero(free[:count] < used[:count]))
+    image[free[:moves]] = image[used[:moves]]
+    image[used[:moves]] = -1
+    return image
+
+
+def spans_from_image(image: np.ndarray) -> tuple[list, list]:
+    """Reads the file spans, indexed by file ID, and the free spans of an image as (start, length) lists."""
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(image)) + 1)) if len(image) else []
+    lengths = np.diff(np.append(starts, len(image)))
+    files = [(0, 0)] * (int(image.max(initial=-1)) + 1)
+    free_spans = []
+    for start, length, value in zip(
+        np.asarray(starts).tolist(), lengths.tolist(), image[starts].tolist()
+    ):
+        if value == -1:
+            free_spans.append((start, length))
         else:
-            break
-    return map
-
-
-def find_free_space(map: list, file_size: int) -> int:
-    """Finds the first available space in the map that can accommodate a file of a given size."""
-    max_index = len(map) - file_size
-    for i in range(max_index + 1):
-        if all(c == "." for c in map[i : i + file_size]):
-            return i
-    return -1
-
-
-def rearrange_disk_2(map: list) -> list:
-    """Rearranges the disk map by moving files (digits) to the leftmost free spaces in descending order of file IDs."""
-    file_ids = sorted(set(int(c) for c in map if c.isdigit()), reverse=True)
-    for file_id in file_ids:
-        file_size = map.count(str(file_id))
-        current_positions = [i for i, c in enumerate(map) if c == str(file_id)]
-        free_space_index = find_free_space(map, file_size)
-        if free_space_index != -1 and free_space_index < current_positions[0]:
-            for pos in current_positions:
-                map[pos] = "."
-            for i in range(free_space_index, free_space_index + file_size):
-                map[i] = str(file_id)
-    return map
+            files[value] = (start, length)
+    return files, free_spans
+
+
+def rearrange_image_2(image: np.ndarray) -> np.ndarray:
+    """Moves whole files to the leftmost free span that fits them, in place, by descending file ID."""
+    files, free_spans = spans_from_image(image)
+    for file_id, ((start, length), (new_start, _)) in enumerate(
+        zip(files, compact_files(files, free_spans))
+    ):
+        if new_start != start:
+            image[start : start + length] = -1
+            image[new_start : new_start + length] = file_id
+    return image
+
+
+def checksum_image(image: np.ndarray) -> int:
+    """Calculates the checksum of an image as dot products of the file IDs with the block
+    positions, split in chunks small enough for each dot product to fit in an int64."""
+    ids = np.where(image >= 0, image, 0).astype(np.int64)
+    positions = np.arange(len(image), dtype=np.int64)
+    largest = max(1, int(ids.max(initial=0)) * len(image))
+    step = max(1, 2**62 // largest)
+    return sum(
+        int(np.dot(ids[i : i + step], positions[i : i + step]))
+        for i in range(0, len(image), step)
+    )
 
 
 def part_one(content: str) -> int:
-    """Calculates the sum of digit values multiplied by their index after rearranging the disk with the first method."""
-    map = get_individual_blocks(content)
-    rearranged_disk = rearrange_disk_1(map)
-    return sum([int(val) * i for i, val in enumerate(rearranged_disk) if val.isdigit()])
+    """Calculates the sum of digit values multiplied by their index after rearranging the disk with the first method,
+    streaming over the disk map with two pointers."""
+    return checksum_compacted_blocks(content)
 
 
 def part_two(content: str) -> int:
-    """Calculates the sum of digit values multiplied by their index after rearranging the disk with the second method."""
-    map = get_individual_blocks(content)
-    rearranged_disk = rearrange_disk_2(map)
-    return sum([int(val) * i for i, val in enumerate(rearranged_disk) if val.isdigit()])
+    """Calculates the sum of digit values multiplied by their index after rearranging the disk with the second method,
+    working on file and free spans instead of individual blocks."""
+    files, free_spans = parse_disk_map(content)
+    return checksum_spans(compact_files(files, free_spans))
+
+
+def part_one_image(content: str) -> int:
+    """Same as part_one, on the block image of the disk."""
+    return checksum_image(rearrange_image_1(get_block_image(content)))
+
+
+def part_two_image(content: str) -> int:
+    """Same as part_two, on the block image of the disk."""
+    return checksum_image(rearrange_image_2(get_block_image(content)))
 
 
 def main() -> None:
@@ -0,0 +1,200 @@
+"""
+Author : Gabriel de Haro
+Date : December 12th, 2024
+Description: Seeded generators of synthetic puzzle inputs for every day, scaled
+relative to the size of the real inputs (scale 1 is roughly the size of input.txt).
+"""
+
+import math
+import random
+import string
+
+GUARD_DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+def side_for_scale(base: int, scale: float) -> int:
+    """Returns the side of a square grid whose area is scale times base * base."""
+    return max(4, round(base * math.sqrt(scale)))
+
+
+def generate_day_1(scale: float, rng: random.Random) -> str:
+    """Generates two columns of location IDs."""
+    lines = []
+    for _ in range(max(1, round(1000 * scale))):
+        lines.append(f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_2(scale: float, rng: random.Random) -> str:
+    """Generates reports of levels, mostly monotonic with an occasional bad step."""
+    lines = []
+    for _ in range(max(1, round(1000 * scale))):
+        sign = rng.choice([-1, 1])
+        level = rng.randint(10, 90)
+        report = [level]
+        for _ in range(rng.randint(4, 7)):
+            if rng.random() < 0.1:
+                step = rng.choice([0, 4, -sign])
+            else:
+                step = rng.randint(1, 3)
+            level += sign * step
+            report.append(level)
+        lines.append(" ".join(map(str, report)))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_3(scale: float, rng: random.Random) -> str:
+    """Generates corrupted memory mixing noise with mul(x,y), do() and don't() instructions."""
+    noise = "mul(),don't[]{}<>?!@#$%^&*_-+=:;' 0123456789whatselectfrom"
+    target = max(100, round(17700 * scale))
+    parts = []
+    size = 0
+    while size < target:
+        draw = rng.random()
+        if draw < 0.05:
+            part = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+        elif draw < 0.06:
+            part = "do()"
+        elif draw < 0.07:
+            part = "don't()"
+        else:
+            part = "".join(rng.choices(noise, k=rng.randint(1, 8)))
+        parts.append(part)
+        size += len(part)
+    content = "".join(parts)
+    width = max(1, len(content) // 6)
+    lines = [content[i : i + width] for i in range(0, len(content), width)]
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_4(scale: float, rng: random.Random) -> str:
+    """Generates a square grid of the letters X, M, A and S."""
+    side = side_for_scale(140, scale)
+    return "\n".join("".join(rng.choices("XMAS", k=side)) for _ in range(side))
+
+
+def generate_day_5(scale: float, rng: random.Random) -> str:
+    """Generates ordering rules over a total order of pages, then manuals to check."""
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{pages[i]}|{pages[j]}" for i in range(49) for j in range(i + 1, 49)]
+    rng.shuffle(rules)
+    manuals = []
+    for _ in range(max(1, round(200 * scale))):
+        length = rng.randrange(5, 24, 2)
+        manual = rng.sample(pages, length)
+        if rng.random() < 0.5:
+            manual.sort(key=pages.index)
+        manuals.append(",".join(map(str, manual)))
+    return "\n".join(rules) + "\n\n" + "\n".join(manuals)
+
+
+def guard_escapes(grid: list, row: int, col: int) -> bool:
+    """Walks the guard on a list of rows and tells if it leaves the grid without looping."""
+    rows, cols = len(grid), len(grid[0])
+    direction = 0
+    seen = set()
+    while True:
+        if (row, col, direction) in seen:
+            return False
+        seen.add((row, col, direction))
+        dr, dc = GUARD_DIRECTIONS[direction]
+        nr, nc = row + dr, col + dc
+        if not (0 <= nr < rows and 0 <= nc < cols):
+            return True
+        if grid[nr][nc] == "#":
+            direction = (direction + 1) % 4
+        else:
+            row, col = nr, nc
+
+
+def generate_day_6(scale: float, rng: random.Random) -> str:
+    """Generates a lab map with scattered obstacles and a guard facing up that leaves the map."""
+    side = side_for_scale(130, scale)
+    while True:
+        grid = [
+            ["#" if rng.random() < 0.012 else "." for _ in range(side)]
+            for _ in range(side)
+        ]
+        row, col = rng.randrange(side // 4, side), rng.randrange(side)
+        grid[row][col] = "^"
+        if guard_escapes(grid, row, col):
+            return "\n".join("".join(line) for line in grid)
+
+
+def generate_day_7(scale: float, rng: random.Random) -> str:
+    """Generates calibration equations, about half of them solvable with +, * and ||."""
+    lines = []
+    for _ in range(max(1, round(850 * scale))):
+        numbers = [rng.choice([rng.randint(1, 9), rng.randint(1, 999)])]
+        for _ in range(rng.randint(2, 11)):
+            numbers.append(rng.choice([rng.randint(1, 9), rng.randint(1, 999)]))
+        value = numbers[0]
+        for number in numbers[1:]:
+            operator = rng.choice("+*|")
+            if operator == "+":
+                value += number
+            elif operator == "*":
+                value *= number
+            else:
+                value = int(f"{value}{number}")
+        if rng.random() < 0.5:
+            value += 1
+        lines.append(f"{value}: {' '.join(map(str, numbers))}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_8(scale: float, rng: random.Random) -> str:
+    """Generates a map of antennas of various frequencies."""
+    side = side_for_scale(50, scale)
+    grid = [["."] * side for _ in range(side)]
+    frequencies = string.digits + string.ascii_letters
+    for _ in range(max(2, round(side * side * 0.07))):
+        grid[rng.randrange(side)][rng.randrange(side)] = rng.choice(frequencies)
+    return "\n".join("".join(line) for line in grid) + "\n"
+
+
+def generate_day_9(scale: float, rng: random.Random) -> str:
+    """Generates a dense disk map alternating file lengths (1-9) and free lengths (0-9)."""
+    length = max(1, round(19999 * scale)) | 1
+    return "".join(
+        str(rng.randint(1, 9)) if i % 2 == 0 else str(rng.randint(0, 9))
+        for i in range(length)
+    )
+
+
+def generate_day_10(scale: float, rng: random.Random) -> str:
+    """Generates a topographic map of diagonal slopes with noise, rich in hiking trails."""
+    side = side_for_scale(45, scale)
+    return (
+        "\n".join(
+            "".join(str((i + j + rng.choice([0, 0, 1])) % 10) for j in range(side))
+            for i in range(side)
+        )
+        + "\n"
+    )
+
+
+def generate_day_11(scale: float, rng: random.Random) -> str:
+    """Generates a line of engraved stones."""
+    count = max(1, round(8 * scale))
+    return " ".join(str(rng.randint(0, 10**7)) for _ in range(count)) + "\n"
+
+
+GENERATORS = {
+    1: generate_day_1,
+    2: generate_day_2,
+    3: generate_day_3,
+    4: generate_day_4,
+    5: generate_day_5,
+    6: generate_day_6,
+    7: generate_day_7,
+    8: generate_day_8,
+    9: generate_day_9,
+    10: generate_day_10,
+    11: generate_day_11,
+}
+
+
+def generate(day: int, scale: float = 1, seed: int = 2024) -> str:
+    """Generates the synthetic input of a day for the given scale and seed."""
+    return GENERATORS[day](scale, random.Random(f"{day}-{scale}-{seed}"))
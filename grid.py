@@ -0,0 +1,92 @@
+"""
+Author : Gabriel de Haro
+Date : December 12th, 2024
+Description: Compact grid of one-byte cells shared by the days working on maps.
+"""
+
+import string
+
+import numpy as np
+
+DIRECTIONS_4 = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+ALPHANUMERIC = string.digits + string.ascii_letters
+
+
+class Grid:
+    """Grid of characters kept in the bytes of the input file, one byte per cell.
+
+    Row i starts at offset i * stride of the buffer, the stride covering the line break.
+    Accessing a cell with at() returns a small int and does not allocate, while array
+    gives a read-only uint8 NumPy view of the same buffer for vectorized work.
+    """
+
+    def __init__(self, buffer: bytes, rows: int, cols: int, stride: int) -> None:
+        self.buffer = buffer
+        self.rows = rows
+        self.cols = cols
+        self.stride = stride
+        self.shape = (rows, cols)
+
+    @classmethod
+    def from_text(cls, content) -> "Grid":
+        """Builds a grid from the content of a file, as str or bytes, with one row per line.
+        Bytes with LF line endings and a single final line break are used as is, without a copy;
+        other content is copied to normalize them."""
+        if isinstance(content, str):
+            content = content.encode()
+        if b"\r" in content:
+            content = content.replace(b"\r\n", b"\n")
+        if not content.endswith(b"\n") or content.endswith(b"\n\n"):
+            content = content.rstrip(b"\n") + b"\n"
+        stride = content.find(b"\n") + 1
+        if len(content) % stride:
+            raise ValueError("All the rows of a grid must have the same length.")
+        return cls(content, len(content) // stride, stride - 1, stride)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Read-only uint8 view of the cells, of shape (rows, cols)."""
+        flat = np.frombuffer(self.buffer, dtype=np.uint8)
+        return flat.reshape(self.rows, self.stride)[:, : self.cols]
+
+    def at(self, i: int, j: int) -> int:
+        """Returns the byte value of the cell at row i, column j."""
+        return self.buffer[i * self.stride + j]
+
+    def char(self, i: int, j: int) -> str:
+        """Returns the character of the cell at row i, column j."""
+        return chr(self.at(i, j))
+
+    def in_bounds(self, i: int, j: int) -> bool:
+        """Checks if the position is inside the grid."""
+        return 0 <= i < self.rows and 0 <= j < self.cols
+
+    def neighbors(self, i: int, j: int, directions: list = DIRECTIONS_4) -> list:
+        """Returns the positions next to (i, j) in the given directions that are inside the grid."""
+        return [(i + di, j + dj) for di, dj in directions if self.in_bounds(i + di, j + dj)]
+
+    def mask(self, chars: str) -> np.ndarray:
+        """Returns a boolean array telling which cells hold one of the given characters."""
+        return np.isin(self.array, np.frombuffer(chars.encode(), dtype=np.uint8))
+
+    def positions(self, chars: str) -> list:
+        """Returns the positions of the cells holding one of the given characters, row by row."""
+        return [tuple(position) for position in np.argwhere(self.mask(chars)).tolist()]
+
+    def group_positions(self, chars: str) -> dict:
+        """Maps each of the given characters present in the grid to its positions, row by row."""
+        mask = self.mask(chars)
+        groups = {}
+        for code, (i, j) in zip(self.array[mask].tolist(), np.argwhere(mask).tolist()):
+            groups.setdefault(chr(code), []).append((i, j))
+        return groups
+
+    def heights(self) -> np.ndarray:
+        """Returns the cells holding digits as an int8 array of their values."""
+        return self.array.astype(np.int8) - ord("0")
+
+
+def read_grid(filepath: str) -> Grid:
+    """Reads a file as bytes and returns it as a grid, straight from the bytes read."""
+    with open(filepath, "rb") as file:
+        return Grid.from_text(file.read())
@@ -0,0 +1,262 @@
+"""
+Author : Gabriel de Haro
+Date : December 12th, 2024
+Description: Runs every day of Advent of Code 2024 in a single process, checks the
+results against each answer.txt and reports the time, and optionally the peak memory, of each part.
+"""
+
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# For each day: how to parse the input once, then how to get the answer of each part.
+# The parts receive the parsed data and a cache shared between the parts of the day.
+# Binary days parse the bytes of the input as read from the file, instead of text.
+SOLVERS = {
+    1: {
+        "parse": lambda m, content: m.parse_columns(content),
+        "part_one": lambda m, data, cache: m.part_one(data[0], data[1]),
+        "part_two": lambda m, data, cache: m.part_two(data[0], data[1]),
+    },
+    2: {
+        "parse": lambda m, content: m.parse_reports(content),
+        "part_one": lambda m, data, cache: m.part_one(data),
+        "part_two": lambda m, data, cache: m.part_two(data),
+    },
+    3: {
+        "parse": lambda m, content: content,
+        "part_one": lambda m, data, cache: m.part_one(data),
+        "part_two": lambda m, data, cache: m.part_two(data),
+    },
+    4: {
+        "binary": True,
+        "parse": lambda m, content: m.string_to_grid(content),
+        "part_one": lambda m, data, cache: m.part_one(data),
+        "part_two": lambda m, data, cache: m.part_two(data),
+    },
+    5: {
+        "parse": lambda m, content: m.split_sections(content),
+        "part_one": lambda m, data, cache: m.part_one(data[0], data[1]),
+        "part_two": lambda m, data, cache: m.part_two(data[0], data[1]),
+    },
+    6: {
+        "binary": True,
+        "parse": lambda m, content: m.string_to_grid(content),
+        "part_one": lambda m, data, cache: len(
+            cache.setdefault("walk", m.walk_guard(data, m.find_guard_position(data)))[0]
+        ),
+        "part_two": lambda m, data, cache: m.part_two(data, cache.get("walk")),
+    },
+    7: {
+        "parse": lambda m, content: m.get_data(content),
+        "part_one": lambda m, data, cache: m.part_one_and_two(data, m.OPERATORS_1),
+        "part_two": lambda m, data, cache: m.part_one_and_two(data, m.OPERATORS_2),
+    },
+    8: {
+        "binary": True,
+        "parse": lambda m, content: m.string_to_grid(content),
+        "part_one": lambda m, data, cache: m.part_one(data),
+        "part_two": lambda m, data, cache: m.part_two(data),
+    },
+    9: {
+        "parse": lambda m, content: content,
+        "part_one": lambda m, data, cache: m.part_one(data),
+        "part_two": lambda m, data, cache: m.part_two(data),
+    },
+    10: {
+        "binary": True,
+        "parse": lambda m, content: m.string_to_grid(content),
+        "part_one": lambda m, data, cache: cache.setdefault("trails", m.count_trails(data))[0],
+        "part_two": lambda m, data, cache: (cache.get("trails") or m.count_trails(data))[1],
+    },
+    11: {
+        "parse": lambda m, content: m.get_data(content),
+        "part_one": lambda m, data, cache: cache.setdefault(
+            "counts", m.counts_at_blinks(data, [25, 75])
+        )[25],
+        "part_two": lambda m, data, cache: (
+            cache.get("counts") or m.counts_at_blinks(data, [25, 75])
+        )[75],
+    },
+}
+
+PARTS = ["part_one", "part_two"]
+
+
+def solve_default(m: ModuleType, data, cache: dict, part: str):
+    """Solves a part of a day without an entry in SOLVERS from its raw content, with part_one
+    or part_two when the day defines them, else with the pair returned by part_one_and_two.
+    Returns None when the day has neither."""
+    if hasattr(m, part):
+        return getattr(m, part)(data)
+    if hasattr(m, "part_one_and_two"):
+        if "results" not in cache:
+            cache["results"] = m.part_one_and_two(data)
+        return cache["results"][PARTS.index(part)]
+    return None
+
+
+# Used for the days found on disk that have no entry in SOLVERS.
+DEFAULT_SOLVER = {
+    "parse": lambda m, content: content,
+    "part_one": lambda m, data, cache: solve_default(m, data, cache, "part_one"),
+    "part_two": lambda m, data, cache: solve_default(m, data, cache, "part_two"),
+}
+
+
+def find_days(root: str = ROOT) -> list:
+    """Returns the sorted numbers of the day_* folders containing a main.py."""
+    days = []
+    for name in os.listdir(root):
+        match = re.fullmatch(r"day_(\d+)", name)
+        if match and os.path.isfile(os.path.join(root, name, "main.py")):
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def load_day(day: int, root: str = ROOT) -> ModuleType:
+    """Imports the main.py of a day as the module day_<day>.main, registered in sys.modules
+    with root on sys.path, so that worker processes can import it again by name to get its
+    functions, whether they are forked or spawned."""
+    if root not in sys.path:
+        sys.path.append(root)
+    path = os.path.join(root, f"day_{day}", "main.py")
+    spec = importlib.util.spec_from_file_location(f"day_{day}.main", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def read_answers(day: int, root: str = ROOT) -> list:
+    """Reads the expected answers of a day, one per line, or None when missing."""
+    path = os.path.join(root, f"day_{day}", "answer.txt")
+    if not os.path.isfile(path):
+        return [None, None]
+    with open(path, "r", encoding="utf-8") as file:
+        answers = [int(line) for line in file.read().split()]
+    return (answers + [None, None])[:2]
+
+
+def measure(function, track_memory: bool = False) -> tuple:
+    """Calls function and returns its result, the wall time in seconds and the peak memory in bytes.
+    tracemalloc slows down every allocation, so the peak memory comes from a second call."""
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run_day(day: int, root: str = ROOT, track_memory: bool = False) -> dict:
+    """Parses the input of a day once, runs both parts and compares them with answer.txt.
+    A part without a result, as for a day with no input.txt or no known entry point, is
+    reported as unsupported instead of failing."""
+    module = load_day(day, root)
+    solver = SOLVERS.get(day, DEFAULT_SOLVER)
+    path = os.path.join(root, f"day_{day}", "input.txt")
+    if os.path.isfile(path) and solver.get("binary"):
+        with open(path, "rb") as file:
+            content = file.read()
+    elif os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as file:
+            content = file.read()
+    else:
+        content = None
+        solver = {key: lambda *args: None for key in DEFAULT_SOLVER}
+
+    data, parse_time, parse_peak = measure(
+        lambda: solver["parse"](module, content), track_memory
+    )
+    report = {"day": day, "parse": {"time": parse_time, "peak": parse_peak}}
+    cache = {}
+    for part, expected in zip(PARTS, read_answers(day, root)):
+        result, elapsed, peak = measure(
+            lambda: solver[part](module, data, cache), track_memory
+        )
+        report[part] = {
+            "result": result,
+            "expected": expected,
+            "ok": result is None or expected is None or result == expected,
+            "time": elapsed,
+            "peak": peak,
+        }
+    return report
+
+
+def format_memory(size: int) -> str:
+    """Formats a size in bytes as a human readable string."""
+    if size is None:
+        return "-"
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def print_report(reports: list) -> None:
+    """Prints one line per part with its result, status, time and peak memory."""
+    print(f"{'day':>4} {'part':<9} {'result':>18} {'status':<8} {'time':>10} {'peak':>10}")
+    for report in reports:
+        parse = report["parse"]
+        print(
+            f"{report['day']:>4} {'parse':<9} {'':>18} {'':<8} "
+            f"{parse['time'] * 1000:>8.1f}ms {format_memory(parse['peak']):>10}"
+        )
+        for part in PARTS:
+            stats = report[part]
+            if stats["result"] is None or stats["expected"] is None:
+                status = "?"
+            else:
+                status = "OK" if stats["ok"] else "FAIL"
+            result = "unsupported" if stats["result"] is None else stats["result"]
+            print(
+                f"{report['day']:>4} {part:<9} {result:>18} {status:<8} "
+                f"{stats['time'] * 1000:>8.1f}ms {format_memory(stats['peak']):>10}"
+            )
+    total = sum(report[part]["time"] for report in reports for part in PARTS)
+    print(f"Total solving time : {total:.3f}s")
+
+
+def run_all(days: list, jobs: int = 1, track_memory: bool = False) -> list:
+    """Runs the given days, serially or across a pool of jobs processes."""
+    if jobs <= 1:
+        return [run_day(day, ROOT, track_memory) for day in days]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_day, day, ROOT, track_memory) for day in days]
+        return [future.result() for future in futures]
+
+
+def main() -> None:
+    """Main function to parse the command line, run the days and display the report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of processes")
+    parser.add_argument(
+        "--memory", action="store_true", help="also measure the peak memory, in a second run"
+    )
+    args = parser.parse_args()
+
+    days = args.days or find_days()
+    reports = run_all(days, args.jobs, args.memory)
+    print_report(reports)
+    if not all(report[part]["ok"] for report in reports for part in PARTS):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()